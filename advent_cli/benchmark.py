@@ -0,0 +1,107 @@
+import gc
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from contextlib import contextmanager
+
+
+def autorange(run, min_time_ns):
+    # same progression as timeit: 1, 2, 5, 10, 20, 50, ... loops until a sample is long enough
+    multiplier = 1
+    while True:
+        for number in (1, 2, 5):
+            number *= multiplier
+            if run(number) >= min_time_ns:
+                return number
+        multiplier *= 10
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    index = (len(ordered) - 1) * fraction
+    lower = int(index)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (index - lower)
+
+
+def summarize(samples):
+    return {
+        'min': min(samples),
+        'median': statistics.median(samples),
+        'p95': percentile(samples, 0.95),
+        'stddev': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+
+def format_ns(ns):
+    for unit, scale in (('s', 10**9), ('ms', 10**6), ('µs', 10**3)):
+        if ns >= scale:
+            return f'{ns / scale:.3g}{unit}'
+    return f'{ns:.3g}ns'
+
+
+# puzzles are built and timed this many at a time, so a fast part that needs a
+# lot of loops doesn't hold that many parsed inputs in memory at once
+BATCH_SIZE = 100
+
+
+def benchmark_part(make_puzzle, part, repeat=10, warmup=1, min_time=0.2):
+    # each loop gets its own freshly constructed puzzle so solutions that mutate
+    # their state between parts still measure the same work every time
+    def prepare(number):
+        puzzles = [make_puzzle() for _ in range(number)]
+        if part == 2:
+            for puzzle in puzzles:
+                if puzzle.always_run_part_1:
+                    puzzle.part1()
+        return puzzles
+
+    def run_batch(size):
+        puzzles = prepare(size)
+        method = 'part1' if part == 1 else 'part2'
+        start = time.perf_counter_ns()
+        for puzzle in puzzles:
+            getattr(puzzle, method)()
+        return time.perf_counter_ns() - start
+
+    def run(number):
+        return sum(run_batch(min(BATCH_SIZE, number - done))
+                   for done in range(0, number, BATCH_SIZE))
+
+    for _ in range(warmup):
+        run(1)
+    number = autorange(run, int(min_time * 10**9))
+    samples = [run(number) / number for _ in range(repeat)]
+    return number, summarize(samples)
+
+
+def ensure_fixed_hash_seed(seed='0'):
+    # the hash seed can only be set at interpreter startup, so re-run ourselves with it.
+    # checks the interpreter, a process forked from one without the seed has it in its
+    # environment but still hashes randomly
+    if os.environ.get('PYTHONHASHSEED') == seed and not sys.flags.hash_randomization:
+        return
+    env = {**os.environ, 'PYTHONHASHSEED': seed}
+    sys.exit(subprocess.run([sys.executable, '-m', 'advent_cli', *sys.argv[1:]],
+                            env=env).returncode)
+
+
+@contextmanager
+def low_noise():
+    affinity = None
+    if hasattr(os, 'sched_getaffinity'):
+        affinity = os.sched_getaffinity(0)
+        os.sched_setaffinity(0, {max(affinity)})
+    gc.collect()
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+        if affinity is not None:
+            os.sched_setaffinity(0, affinity)
@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import re
+import time
+
+from . import config
+
+
+FOREVER = float('inf')
+
+# (pattern, ttl in seconds) checked in order, urls that match nothing are never cached.
+# AoC asks that private leaderboards be polled no more than once every 15 minutes.
+# a ttl of 0 means the entry is always revalidated with a conditional request
+TTLS = [
+    (re.compile(r'/leaderboard/private/view/\d+(\.json)?$'), 15 * 60),
+    (re.compile(r'/leaderboard/self$'), 15 * 60),
+    (re.compile(r'/day/\d+/input$'), FOREVER),
+    (re.compile(r'/day/\d+$'), 0),
+]
+
+
+def configure(enabled=True, refresh=False):
+    # --no-cache and --refresh override whatever the environment and config file say
+    config.override(cache_enabled=enabled, cache_refresh=refresh)
+
+
+def ttl_for(url):
+    for pattern, ttl in TTLS:
+        if pattern.search(url):
+            return ttl
+    return None
+
+
+def cache_key(url, session_cookie):
+    # the session is hashed so the cookie itself never ends up in file names
+    identity = hashlib.sha256(session_cookie.encode()).hexdigest()
+    return hashlib.sha256(f'{identity}\0{url}'.encode()).hexdigest()
+
+
+def _paths(key):
+    cache_dir = config.get_config().cache_dir
+    return os.path.join(cache_dir, f'{key}.json'), os.path.join(cache_dir, f'{key}.body')
+
+
+def _write_atomic(path, data):
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def load(key):
+    meta_path, body_path = _paths(key)
+    try:
+        with open(meta_path, 'r') as f:
+            meta = json.load(f)
+        with open(body_path, 'rb') as f:
+            body = f.read()
+    except (OSError, ValueError):
+        return None
+    touch(key)
+    return meta, body
+
+
+def is_fresh(meta):
+    return time.time() - meta['stored_at'] < ttl_for(meta['url'])
+
+
+def validators(meta):
+    headers = {}
+    if meta['headers'].get('ETag'):
+        headers['If-None-Match'] = meta['headers']['ETag']
+    if meta['headers'].get('Last-Modified'):
+        headers['If-Modified-Since'] = meta['headers']['Last-Modified']
+    return headers
+
+
+def store(key, url, headers, body, encoding=None):
+    os.makedirs(config.get_config().cache_dir, exist_ok=True)
+    meta_path, body_path = _paths(key)
+    meta = {
+        'url': url,
+        'stored_at': time.time(),
+        'encoding': encoding,
+        'headers': {k: headers[k] for k in ('Content-Type', 'ETag', 'Last-Modified')
+                    if headers.get(k)}
+    }
+    _write_atomic(body_path, body)
+    _write_atomic(meta_path, json.dumps(meta).encode())
+    evict(config.get_config().cache_size)
+    return meta
+
+
+def revalidated(key, meta):
+    meta['stored_at'] = time.time()
+    _write_atomic(_paths(key)[0], json.dumps(meta).encode())
+
+
+def touch(key):
+    # the mtime of the metadata file doubles as the last access time for LRU eviction
+    try:
+        os.utime(_paths(key)[0])
+    except OSError:
+        pass
+
+
+def _entries():
+    cache_dir = config.get_config().cache_dir
+    if not os.path.isdir(cache_dir):
+        return []
+    entries = []
+    for filename in os.listdir(cache_dir):
+        if not filename.endswith('.json'):
+            continue
+        key = filename[:-len('.json')]
+        meta_path, body_path = _paths(key)
+        try:
+            size = os.path.getsize(meta_path) + os.path.getsize(body_path)
+            entries.append((os.path.getmtime(meta_path), size, key))
+        except OSError:
+            continue
+    return entries
+
+
+def evict(max_bytes):
+    entries = sorted(_entries())
+    total = sum(size for _, size, _ in entries)
+    for _, size, key in entries:
+        if total <= max_bytes:
+            break
+        for path in _paths(key):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        total -= size
+
+
+def clear():
+    evict(0)
@@ -1,88 +1,202 @@
 import argparse
+import sys
 from datetime import datetime as dt
 
-from . import commands
 from ._version import __version__
+from .lazy import lazy_import
 from .utils import CustomHelpFormatter
 
+cache = lazy_import('advent_cli.cache')
+commands = lazy_import('advent_cli.commands')
+daemon = lazy_import('advent_cli.daemon')
 
-def main():
-    parser = argparse.ArgumentParser(formatter_class=CustomHelpFormatter)
+# commands that run solutions, the rest are quick enough to run without the daemon
+DAEMON_COMMANDS = ('test', 'submit', 'bench')
+
+
+def add_cache_arguments(parser):
     parser.add_argument(
-        '-v', '--version',
-        action='version',
-        version=f'advent-cli {__version__}'
+        '--no-cache',
+        dest='no_cache',
+        action='store_true',
+        help='do not read or write the local response cache'
     )
-    command_subparsers = parser.add_subparsers(
-        dest='command', description='use advent {subcommand} --help for arguments'
+    parser.add_argument(
+        '--refresh',
+        dest='refresh',
+        action='store_true',
+        help='ignore cached responses and download fresh copies'
     )
-    parser_get = command_subparsers.add_parser(
-        'get',
-        help='download prompt and input, generate solution template',
-        formatter_class=CustomHelpFormatter
+
+
+def add_limit_arguments(parser):
+    parser.add_argument(
+        '--timeout',
+        dest='timeout',
+        type=float,
+        help='run the solution in a child process and stop it after this many seconds'
     )
-    parser_get.add_argument(
+    parser.add_argument(
+        '--memory-limit',
+        dest='memory_limit',
+        type=int,
+        help='run the solution in a child process limited to this many MB\n'
+             'of address space'
+    )
+
+
+def add_force_argument(parser):
+    parser.add_argument(
+        '--force',
+        dest='force',
+        action='store_true',
+        help='run the solution even if it and its input are unchanged since\n'
+             'answers were last saved'
+    )
+
+
+def add_get_arguments(parser):
+    parser.add_argument(
         '-d', '--date',
         dest='date',
         help='the year and day in YYYY/DD format (e.g. "2021/01")'
     )
-    parser_stats = command_subparsers.add_parser(
-        'stats',
-        help='show personal stats or private leaderboards',
-        formatter_class=CustomHelpFormatter
+    parser.add_argument(
+        '-y', '--year',
+        dest='year',
+        help='the year for --all, defaults to the selected year'
+    )
+    parser.add_argument(
+        '-a', '--all',
+        dest='get_all',
+        action='store_true',
+        help='download every unlocked day of the year not yet on disk'
     )
-    parser_stats.add_argument(
+    add_cache_arguments(parser)
+
+
+def add_stats_arguments(parser):
+    parser.add_argument(
         'year',
         nargs='?',
         default=dt.now().year,
         help='year to show stats for, defaults to current year'
     )
-    parser_stats.add_argument(
+    parser.add_argument(
         '-p', '--private',
         dest='show_private',
         action='store_true',
         help='show private leaderboard(s)'
     )
-    parser_test = command_subparsers.add_parser(
-        'test',
-        help='run solution and output answers without submitting',
-        formatter_class=CustomHelpFormatter
-    )
-    parser_test.add_argument(
+    add_cache_arguments(parser)
+
+
+def add_test_arguments(parser):
+    parser.add_argument(
         '-d', '--date',
         dest='date',
         help='the year and day in YYYY/DD format (e.g. "2021/01")'
     )
-    parser_test.add_argument(
+    parser.add_argument(
+        '-y', '--year',
+        dest='year',
+        help='the year for --all, defaults to the selected year'
+    )
+    parser.add_argument(
+        '-a', '--all',
+        dest='test_all',
+        action='store_true',
+        help='test every day of the year in parallel against saved answers'
+    )
+    parser.add_argument(
         '-e', '--example',
         dest='run_example',
         action='store_true',
         help='use example_input.txt for input'
     )
-    parser_test.add_argument(
+    parser.add_argument(
+        '-w', '--watch',
+        dest='watch',
+        action='store_true',
+        help='re-run whenever the solution or its input changes'
+    )
+    parser.add_argument(
+        '--fail-fast',
+        dest='fail_fast',
+        action='store_true',
+        help='with --example, stop at the first failing test input file'
+    )
+    parser.add_argument(
+        '--parallel-parts',
+        dest='parallel_parts',
+        action='store_true',
+        help='run part 1 and part 2 at the same time in separate processes\n'
+             '(part 2 still runs after part 1 when always_run_part_1 is True)'
+    )
+    add_limit_arguments(parser)
+    add_force_argument(parser)
+    parser.add_argument(
+        '--profile',
+        dest='profile',
+        action='store_true',
+        help='profile each phase with cProfile, print the hottest functions\n'
+             'and save .prof files next to the solution'
+    )
+    parser.add_argument(
+        '--profile-top',
+        dest='profile_top',
+        type=int,
+        default=15,
+        help='number of functions to show per phase with --profile (default 15)'
+    )
+    parser.add_argument(
+        '--flamegraph',
+        dest='flamegraph',
+        action='store_true',
+        help='also sample call stacks and save .collapsed files\n'
+             '(for flamegraph.pl or speedscope)'
+    )
+    parser.add_argument(
+        '--memory',
+        dest='memory',
+        action='store_true',
+        help='measure peak and net allocations (tracemalloc) and max RSS\n'
+             'for each phase'
+    )
+    parser.add_argument(
         '-p', '--part',
         dest='puzzle_part',
         default='0',
         help='only run a specific part (1 or 2)',        
     )
-    parser_test.add_argument(
+    parser.add_argument(
         '-f', '--solution-file',
         dest='solution_file',
         default='solution',
         help='solution file to run instead of solution.py\n'
              '(e.g. "solution2" for solution2.py)'
     )
-    parser_submit = command_subparsers.add_parser(
-        'submit',
-        help='run solution and submit answers',
-        formatter_class=CustomHelpFormatter
-    )
-    parser_submit.add_argument(
+
+
+def add_submit_arguments(parser):
+    parser.add_argument(
         '-d', '--date',
         dest='date',
         help='the year and day in YYYY/DD format (e.g. "2021/01")'
     )
-    parser_submit.add_argument(
+    parser.add_argument(
+        '-y', '--year',
+        dest='year',
+        help='the year for --all-pending, defaults to the selected year'
+    )
+    parser.add_argument(
+        '--all-pending',
+        dest='all_pending',
+        action='store_true',
+        help='compute every unsolved day of the year in parallel and submit\n'
+             'the answers one by one, waiting out rate limits'
+    )
+    parser.add_argument(
         '-f', '--solution-file',
         dest='solution_file',
         default='solution',
@@ -90,46 +204,151 @@ def main():
              '(e.g. "solution2" for solution2.py)\n'
              '*only works if answers not yet submitted*'
     )
-    parser_submit.add_argument(
+    parser.add_argument(
         '-p', '--part',
         dest='puzzle_part',
         default='0',
         help='only run a specific part (1 or 2)'
-    )        
-    parser_countdown = command_subparsers.add_parser(
-        'countdown',
-        help='display countdown to puzzle unlock',
-        formatter_class=CustomHelpFormatter
     )
-    parser_countdown.add_argument(
-        'date',
+    parser.add_argument(
+        '--memory',
+        dest='memory',
+        action='store_true',
+        help='measure peak and net allocations (tracemalloc) and max RSS\n'
+             'for each phase'
+    )
+    add_limit_arguments(parser)
+    add_force_argument(parser)
+
+
+def add_bench_arguments(parser):
+    parser.add_argument(
+        '-d', '--date',
+        dest='date',
         help='the year and day in YYYY/DD format (e.g. "2021/01")'
     )
-    parser_year = command_subparsers.add_parser(
-        'year',
-        help='set the current year',
-        formatter_class=CustomHelpFormatter
+    parser.add_argument(
+        '-f', '--solution-file',
+        dest='solution_file',
+        default='solution',
+        help='solution file to run instead of solution.py\n'
+             '(e.g. "solution2" for solution2.py)'
+    )
+    parser.add_argument(
+        '-p', '--part',
+        dest='puzzle_part',
+        default='0',
+        help='only run a specific part (1 or 2)'
+    )
+    parser.add_argument(
+        '-r', '--repeat',
+        dest='repeat',
+        type=int,
+        default=10,
+        help='number of timed samples per part (default 10)'
+    )
+    parser.add_argument(
+        '-w', '--warmup',
+        dest='warmup',
+        type=int,
+        default=1,
+        help='number of untimed warmup runs per part (default 1)'
+    )
+    parser.add_argument(
+        '--min-time',
+        dest='min_time',
+        type=float,
+        default=0.2,
+        help='minimum seconds per sample, used to pick the loop count (default 0.2)'
+    )
+    parser.add_argument(
+        '--low-noise',
+        dest='low_noise',
+        action='store_true',
+        help='disable gc, fix PYTHONHASHSEED and pin to a single cpu while timing'
+    )
+
+
+def add_countdown_arguments(parser):
+    parser.add_argument(
+        'date',
+        help='the year and day in YYYY/DD format (e.g. "2021/01")'
     )
-    parser_year.add_argument(
+
+
+def add_year_arguments(parser):
+    parser.add_argument(
         'year',
         help='the year YYYY format (e.g. "2021")'
     )
-    parser_day = command_subparsers.add_parser(
-        'day',
-        help='set the current day',
-        formatter_class=CustomHelpFormatter
-    )
-    parser_day.add_argument(
+
+
+def add_day_arguments(parser):
+    parser.add_argument(
         'day',
         help='the day in DD format (e.g. "03")'
     )
+
+
+def add_daemon_arguments(parser):
+    parser.add_argument(
+        '--stop',
+        dest='stop',
+        action='store_true',
+        help='stop the running daemon'
+    )
+
+
+COMMANDS = [
+    ('get', 'download prompt and input, generate solution template', add_get_arguments),
+    ('stats', 'show personal stats or private leaderboards', add_stats_arguments),
+    ('test', 'run solution and output answers without submitting', add_test_arguments),
+    ('submit', 'run solution and submit answers', add_submit_arguments),
+    ('bench', 'time a solution over repeated runs', add_bench_arguments),
+    ('countdown', 'display countdown to puzzle unlock', add_countdown_arguments),
+    ('year', 'set the current year', add_year_arguments),
+    ('day', 'set the current day', add_day_arguments),
+    ('daemon', 'keep a warm process that runs test, submit and bench', add_daemon_arguments),
+]
+
+
+def main():
+    argv = sys.argv[1:]
+    # test, submit and bench run in a warm daemon process when one is listening, except
+    # --low-noise, whose fixed hash seed needs an interpreter started with it
+    if argv and argv[0] in DAEMON_COMMANDS and '--low-noise' not in argv:
+        code = daemon.forward(argv)
+        if code is not None:
+            sys.exit(code)
+
+    parser = argparse.ArgumentParser(formatter_class=CustomHelpFormatter)
+    parser.add_argument(
+        '-v', '--version',
+        action='version',
+        version=f'advent-cli {__version__}'
+    )
+    command_subparsers = parser.add_subparsers(
+        dest='command', description='use advent {subcommand} --help for arguments'
+    )
+    # every subcommand is listed in --help, but only the one being run gets its arguments
+    requested = next((arg for arg in argv if not arg.startswith('-')), None)
+    for name, help, add_arguments in COMMANDS:
+        subparser = command_subparsers.add_parser(name, help=help,
+                                                  formatter_class=CustomHelpFormatter)
+        if name == requested:
+            add_arguments(subparser)
     args = parser.parse_args()
     print()
+    if args.command in ('get', 'stats'):
+        cache.configure(enabled=not args.no_cache, refresh=args.refresh)
+
     if args.command == 'get':
         
         if args.date:
             year, day = args.date.split('/')
             commands.get(year, day)
+        elif args.get_all:
+            commands.get_all(args.year)
         else:
             commands.get(None, None)
 
@@ -140,18 +359,41 @@ def main():
             commands.stats(args.year)
 
     elif args.command == 'test':
-        if args.date:
-            year, day = args.date.split('/')
-            commands.test(year, day, solution_file=args.solution_file, example=args.run_example, part=args.puzzle_part)
+        if args.test_all and not args.date:
+            commands.test_all(args.year, solution_file=args.solution_file)
         else:
-            commands.test(None, None, solution_file=args.solution_file, example=args.run_example, part=args.puzzle_part)
+            year, day = args.date.split('/') if args.date else (None, None)
+            run = commands.watch_test if args.watch else commands.test
+            run(year, day, solution_file=args.solution_file, example=args.run_example,
+                part=args.puzzle_part, profile=args.profile, profile_top=args.profile_top,
+                flamegraph=args.flamegraph, memory=args.memory, fail_fast=args.fail_fast,
+                parallel_parts=args.parallel_parts, timeout=args.timeout,
+                memory_limit=args.memory_limit, force=args.force)
 
     elif args.command == 'submit':
-        if args.date:
+        if args.all_pending and not args.date:
+            commands.submit_all_pending(args.year, solution_file=args.solution_file)
+        elif args.date:
             year, day = args.date.split('/')
-            commands.submit(year, day, solution_file=args.solution_file, part=args.puzzle_part)
+            commands.submit(year, day, solution_file=args.solution_file, part=args.puzzle_part,
+                            memory=args.memory, timeout=args.timeout,
+                            memory_limit=args.memory_limit, force=args.force)
+        else:
+            commands.submit(None, None, solution_file=args.solution_file, part=args.puzzle_part,
+                            memory=args.memory, timeout=args.timeout,
+                            memory_limit=args.memory_limit, force=args.force)
+
+    elif args.command == 'bench':
+        year, day = args.date.split('/') if args.date else (None, None)
+        commands.bench(year, day, solution_file=args.solution_file, part=args.puzzle_part,
+                       repeat=args.repeat, warmup=args.warmup, min_time=args.min_time,
+                       low_noise=args.low_noise)
+
+    elif args.command == 'daemon':
+        if args.stop:
+            commands.stop_daemon()
         else:
-            commands.submit(None, None, solution_file=args.solution_file, part=args.puzzle_part)
+            commands.start_daemon()
 
     elif args.command == 'countdown':
         year, day = args.date.split('/')
@@ -0,0 +1,122 @@
+import requests
+import threading
+import time
+
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+from . import cache, config
+from ._version import __version__
+
+
+USER_AGENT = f'advent-cli/{__version__} (+https://github.com/fergusch/advent-cli)'
+
+# only idempotent requests are retried, a repeated answer POST could cost a lockout
+RETRY_METHODS = frozenset(['GET', 'HEAD'])
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+_session = None
+_limiter = None
+
+
+class RateLimiter:
+    # spaces requests at least 1/rate seconds apart across all threads
+
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate > 0 else 0
+        self.lock = threading.Lock()
+        self.next_slot = 0
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_slot - now
+            self.next_slot = max(now, self.next_slot) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+def get_session():
+    global _session
+    if _session is None:
+        conf = config.get_config()
+        # urllib3 only retries failed connections, error statuses are retried in request()
+        # so that every attempt waits its turn on the rate limiter
+        retry = Retry(
+            total=conf.http_retries,
+            backoff_factor=conf.http_backoff,
+            allowed_methods=RETRY_METHODS
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=conf.http_pool_size,
+                              max_retries=retry)
+        _session = requests.Session()
+        _session.headers['User-Agent'] = USER_AGENT
+        _session.mount('https://', adapter)
+        _session.mount('http://', adapter)
+    return _session
+
+
+def get_limiter():
+    global _limiter
+    if _limiter is None:
+        _limiter = RateLimiter(config.get_config().max_requests_per_second)
+    return _limiter
+
+
+def close_session():
+    global _session, _limiter
+    _limiter = None
+    if _session is not None:
+        _session.close()
+        _session = None
+
+
+def request(method, url, **kwargs):
+    conf = config.get_config()
+    kwargs.setdefault('cookies', {'session': conf.session_cookie})
+    kwargs.setdefault('timeout', conf.http_timeout)
+    retries = conf.http_retries if method in RETRY_METHODS else 0
+    for attempt in range(retries + 1):
+        get_limiter().wait()
+        r = get_session().request(method, url, **kwargs)
+        if r.status_code not in RETRY_STATUSES or attempt == retries:
+            return r
+        time.sleep(conf.http_backoff * 2 ** attempt)
+
+
+def _cached_response(url, meta, body):
+    r = requests.Response()
+    r.status_code = 200
+    r.url = url
+    r.headers = CaseInsensitiveDict(meta['headers'])
+    r.encoding = meta['encoding']
+    r._content = body
+    return r
+
+
+def get(url, **kwargs):
+    conf = config.get_config()
+    if not conf.cache_enabled or cache.ttl_for(url) is None:
+        return request('GET', url, **kwargs)
+
+    key = cache.cache_key(url, conf.session_cookie)
+    entry = None if conf.cache_refresh else cache.load(key)
+    if entry is not None:
+        meta, body = entry
+        if cache.is_fresh(meta):
+            return _cached_response(url, meta, body)
+        kwargs['headers'] = {**kwargs.get('headers', {}), **cache.validators(meta)}
+
+    r = request('GET', url, **kwargs)
+    if r.status_code == 304 and entry is not None:
+        cache.revalidated(key, meta)
+        return _cached_response(url, meta, body)
+    # never cache the logged out version of a page
+    if r.status_code == 200 and '[Log In]' not in r.text:
+        cache.store(key, url, r.headers, r.content, r.encoding)
+    return r
+
+
+def post(url, data=None, **kwargs):
+    return request('POST', url, data=data, **kwargs)
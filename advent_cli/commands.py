@@ -1,27 +1,47 @@
-import curses
-import importlib
 import os
-import pytz
-import re
-import requests
 import sys
 import time
-import configparser
+import traceback
 
-from bs4 import BeautifulSoup
+from contextlib import nullcontext
 from datetime import datetime as dt
-from tabulate import tabulate
 
-from . import config
+from . import config, inputs
+from .lazy import lazy_import
+from .phases import PhaseRecorder, format_bytes
 from .utils import (
     colored,
     compute_answers,
-    custom_markdownify,
     get_time_until_unlock,
+    input_file,
+    load_solution,
+    parse_day_page,
+    part_markdown,
+    prompt_markdown,
     submit_answer,
+    unlocked_days,
+    RunStatus,
     Status
 )
 
+# heavy dependencies are only loaded by the commands that use them
+curses = lazy_import('curses')
+pytz = lazy_import('pytz')
+tabulate = lazy_import('tabulate')
+futures = lazy_import('concurrent.futures')
+resources = lazy_import('importlib.resources')
+multiprocessing = lazy_import('multiprocessing')
+benchmark = lazy_import('advent_cli.benchmark')
+client = lazy_import('advent_cli.client')
+daemon = lazy_import('advent_cli.daemon')
+leaderboard = lazy_import('advent_cli.leaderboard')
+memo = lazy_import('advent_cli.memo')
+parsing = lazy_import('advent_cli.parsing')
+profiling = lazy_import('advent_cli.profiling')
+results = lazy_import('advent_cli.results')
+runner = lazy_import('advent_cli.runner')
+watch = lazy_import('advent_cli.watch')
+
 def infer_year():
     selected = 2015
     for y in range(2015, dt.now().year + 1):
@@ -40,38 +60,36 @@ def infer_day(year):
             break
     return f'{selected:02}'
 
+
+# printed the first time a command falls back to the configured year and day
+announced = False
+
+
 def load_configuration():
-    lconfig = configparser.ConfigParser()
-    lconfig.read('aoc_cli_config.ini')
-    if 'DEFAULT' not in lconfig:
-        lconfig['DEFAULT'] = {}
-    if 'year' not in lconfig['DEFAULT']:
-        lconfig['DEFAULT']['year'] = infer_year()
-    if 'day' not in lconfig['DEFAULT']:
-        lconfig['DEFAULT']['day'] = infer_day(lconfig['DEFAULT']['year'])
-    lconfig.write(open('aoc_cli_config.ini', 'w'))
-    print(colored("Configured Day: " + lconfig['DEFAULT']['year'] + "/" + lconfig['DEFAULT']['day'], "grey"))    
-    return lconfig
-    
+    global announced
+    conf = config.get_config()
+    # only scan the directories and write the file when something is missing
+    if conf.year is None or conf.day is None:
+        year = conf.year or infer_year()
+        config.save_file(year=year, day=conf.day or infer_day(year))
+        conf = config.get_config()
+    if not announced:
+        print(colored("Configured Day: " + conf.year + "/" + conf.day, "grey"))
+        announced = True
+    return conf
+
 
-my_config = load_configuration()
-selected_year = my_config['DEFAULT']['year']
-selected_day = my_config['DEFAULT']['day']
 def raw_set_year(year):
-    globals()['selected_year'] = year
-    my_config.set('DEFAULT', 'year', year)
-    my_config.write(open('aoc_cli_config.ini', 'w'))
+    config.save_file(year=year)
 
 def raw_set_day(day):
-    globals()['selected_day'] = day
-    my_config.set('DEFAULT', 'day', day)
-    my_config.write(open('aoc_cli_config.ini', 'w'))
+    config.save_file(day=day)
 
 
 def raw_get_year():
-    return globals()['selected_year']
+    return load_configuration().year
 def raw_get_day():
-    return globals()['selected_day']
+    return load_configuration().day
 
 
 def set_year(year):
@@ -124,15 +142,13 @@ def get(year, day):
     
     
 
-    template = importlib.resources.read_text('advent_cli', 'template.txt')
+    template = resources.read_text('advent_cli', 'template.txt')
     if os.path.exists(f'{year}/{day}/'):
         print(colored('Directory already exists:', 'red'))
         print(colored(f'  {os.getcwd()}/{year}/{day}/', 'red'))
         return
 
-    conf = config.get_config()
-    r = requests.get(f'https://adventofcode.com/{year}/day/{int(day)}',
-                     cookies={'session': conf['session_cookie']})
+    r = client.get(f'https://adventofcode.com/{year}/day/{int(day)}')
     if r.status_code == 404:
         if 'before it unlocks!' in r.text:
             print(colored('This puzzle has not unlocked yet.', 'red'))
@@ -151,33 +167,77 @@ def get(year, day):
 
     os.makedirs(f'{year}/{day}/')
 
-    soup = BeautifulSoup(r.text, 'html.parser')
-    part1_html = soup.find('article', class_='day-desc').decode_contents()
-
-    # remove hyphens from title sections, makes markdown look nicer
-    part1_html = re.sub('--- (.*) ---', r'\1', part1_html)
-
-    # also makes markdown look better
-    #part1_html = part1_html.replace('\n\n', '\n')
-
     with open(f'{year}/{day}/prompt.md', 'w') as f:
-        f.write(custom_markdownify(part1_html))
+        f.write(prompt_markdown(r.text))
     print(f'Downloaded prompt to {year}/{day}/prompt.md')
 
-    
-
-    r = requests.get(f'https://adventofcode.com/{year}/day/{int(day)}/input',
-                     cookies={'session': conf['session_cookie']})
+    r = client.get(f'https://adventofcode.com/{year}/day/{int(day)}/input')
     with open(f'{year}/{day}/input.txt', 'w') as f:
         f.write(r.text)
     print(f'Downloaded input to {year}/{day}/input.txt')
 
+    write_solution_template(year, day, template)
+    print(f'Created {year}/{day}/solution.py')
+
+
+def write_solution_template(year, day, template):
     with open(f'{year}/{day}/solution.py', 'w') as f:
         f.write(f'## advent of code {year}\n'
                 f'## https://adventofcode.com/{year}\n'
                 f'## day {day}\n\n')
         f.write(template)
-    print(f'Created {year}/{day}/solution.py')
+
+
+def fetch_day(year, day):
+    r = client.get(f'https://adventofcode.com/{year}/day/{int(day)}')
+    if r.status_code != 200 or '[Log In]' in r.text:
+        return None
+    prompt_html = r.text
+    r = client.get(f'https://adventofcode.com/{year}/day/{int(day)}/input')
+    if r.status_code != 200:
+        return None
+    return prompt_html, r.text
+
+
+def get_all(year):
+    if not year:
+        year = get_year()
+
+    days = [f'{d:02}' for d in range(1, unlocked_days(year) + 1)
+            if not os.path.exists(f'{year}/{d:02}/')]
+    if not days:
+        print(colored(f'Nothing to download, every unlocked day of {year} '
+                      f'already exists.', 'yellow'))
+        return
+    print(colored(f"Getting {len(days)} day(s) of {year}", "yellow"))
+
+    # downloads are bounded by the concurrency limit and the client's rate limiter,
+    # markdown conversion is cpu bound so it gets its own process pool
+    conf = config.get_config()
+    with futures.ThreadPoolExecutor(conf.max_concurrency) as executor:
+        pages = list(executor.map(lambda day: fetch_day(year, day), days))
+
+    fetched = [(day, page) for day, page in zip(days, pages) if page is not None]
+    for day, page in zip(days, pages):
+        if page is None:
+            print(colored(f'Could not download {year}/{day}, skipping it.', 'red'))
+    if not fetched:
+        return
+
+    with futures.ProcessPoolExecutor() as executor:
+        prompts = list(executor.map(prompt_markdown, [page[0] for _, page in fetched]))
+
+    template = resources.read_text('advent_cli', 'template.txt')
+    for (day, (_, input_text)), prompt in zip(fetched, prompts):
+        os.makedirs(f'{year}/{day}/')
+        with open(f'{year}/{day}/prompt.md', 'w') as f:
+            f.write(prompt)
+        with open(f'{year}/{day}/input.txt', 'w') as f:
+            f.write(input_text)
+        write_solution_template(year, day, template)
+        print(f'Created {year}/{day}/')
+
+    set_day(fetched[-1][0])
 
 
 def stats(year):
@@ -187,13 +247,12 @@ def stats(year):
         year = str(today.year - 1)
 
     conf = config.get_config()
-    r = requests.get(f'https://adventofcode.com/{year}/leaderboard/self',
-                     cookies={'session': conf['session_cookie']})
+    r = client.get(f'https://adventofcode.com/{year}/leaderboard/self')
     if '[Log In]' in r.text:
         print(colored('Session cookie is invalid or expired.', 'red'))
         return
 
-    soup = BeautifulSoup(r.text, 'html.parser')
+    soup = parsing.parse(r.text, parsing.STATS_PAGE)
 
     table = soup.select('article pre')[0].text
     table_rows = [x.split() for x in table.split('\n')[2:-1]]
@@ -222,7 +281,7 @@ def stats(year):
           f'({colored("*", "cyan")} 1 star) '
           f'({colored("*", "grey")} 0 stars)\n')
 
-    print(tabulate(table_rows, stralign='right', headers=[
+    print(tabulate.tabulate(table_rows, stralign='right', headers=[
         '\nDay',
         *['\n'.join([colored(y, 'cyan') for y in x.split('\n')])
             for x in ['----\nTime', '(Part 1)\nRank', '----\nScore']],
@@ -230,13 +289,58 @@ def stats(year):
             for x in ['----\nTime', '(Part 2)\nRank', '----\nScore']]
     ]), '\n')
 
-    if conf['private_leaderboards']:
-        num_private_leaderboards = len(conf['private_leaderboards'])
+    if conf.private_leaderboards:
+        num_private_leaderboards = len(conf.private_leaderboards)
         print(colored(f'You are a member of {num_private_leaderboards} '
                       f'private leaderboard(s).', 'grey'))
         print(colored(f'Use "advent stats {year} --private" to see them.\n', 'grey'))
 
 
+def fetch_private_leaderboard(year, board_id):
+    url = f'https://adventofcode.com/{year}/leaderboard/private/view/{board_id}'
+
+    # the json api is much cheaper to parse, the html page is kept as a fallback
+    r = client.get(f'{url}.json')
+    if r.status_code == 200:
+        try:
+            return leaderboard.parse_json(r.text, year)
+        except (ValueError, KeyError, TypeError):
+            pass
+
+    r = client.get(url)
+    if '[Log In]' in r.text:
+        return None
+    return leaderboard.parse_html(r.text)
+
+
+def print_private_leaderboard(board_id, board):
+    top_score_len = len(str(board.members[0].score)) if board.members else 1
+    print(f"\n{board.owner}'s private leaderboard {colored(f'({board_id})', 'grey')}")
+    print(f'\n{" "*(top_score_len+14)}1111111111222222'
+          f'\n{" "*(top_score_len+5)}1234567890123456789012345')
+
+    for member in board.members:
+        position = f'{member.position})' if member.position is not None else ''
+        print(f'{position:>3} {member.score:>{top_score_len}}', end=' ')
+        for stars in member.stars:
+            if stars == leaderboard.BOTH:
+                print(colored('*', 'yellow'), end='')
+            elif stars == leaderboard.FIRST_ONLY:
+                print(colored('*', 'cyan'), end='')
+            elif stars == leaderboard.NO_STARS:
+                print(colored('*', 'grey'), end='')
+            else:
+                print(' ', end='')
+
+        print(f' {member.name}', end=' ')
+        print(f'({colored(member.link, "blue")})' if member.link is not None else '')
+
+    print()
+    print(f'({colored("*", "yellow")} 2 stars) '
+          f'({colored("*", "cyan")} 1 star) '
+          f'({colored("*", "grey")} 0 stars)\n')
+
+
 def private_leaderboard_stats(year):
     today = dt.today()
     if today.year <= int(year) and today.month < 12:
@@ -244,66 +348,24 @@ def private_leaderboard_stats(year):
         year = str(today.year - 1)
 
     conf = config.get_config()
-    if conf['private_leaderboards']:
-        for board_id in conf['private_leaderboards']:
-            r = requests.get(
-                f'https://adventofcode.com/{year}/leaderboard/private/view/{board_id}',
-                cookies={'session': conf['session_cookie']}
-            )
-            if '[Log In]' in r.text:
-                print(colored('Session cookie is invalid or expired.', 'red'))
-                return
-
-            soup = BeautifulSoup(r.text, 'html.parser')
-
-            intro_text = soup.select('article p')[0].text
-            board_owner = soup.find('div', class_='user').contents[0].strip() \
-                if 'This is your' in intro_text \
-                else re.findall(r'private leaderboard of (.*) for', intro_text)[0]
-
-            rows = soup.find_all('div', class_='privboard-row')[1:]
-
-            top_score_len = len(rows[0].find_all(text=True, recursive=False)[0].strip())
-            print(f"\n{board_owner}'s private leaderboard {colored(f'({board_id})', 'grey')}")
-            print(f'\n{" "*(top_score_len+14)}1111111111222222'
-                  f'\n{" "*(top_score_len+5)}1234567890123456789012345')
-
-            for row in rows:
-                position = row.find('span', class_='privboard-position').text
-                if len(position) == 2:
-                    position = " " + position
-                stars = row.find_all('span', class_=re.compile('privboard-star-*'))
-                name = row.find('span', class_='privboard-name').text
-                name_link = row.select('.privboard-name a')[0].attrs['href'] \
-                    if len(row.select('.privboard-name a')) else None
-                score = row.find_all(text=True, recursive=False)[0].strip()
-
-                print(f'{position} {score:>{top_score_len}}', end=' ')
-                for span in stars:
-                    class_ = span.attrs['class'][0]
-                    if 'both' in class_:
-                        print(colored('*', 'yellow'), end='')
-                    elif 'firstonly' in class_:
-                        print(colored('*', 'cyan'), end='')
-                    elif 'unlocked' in class_:
-                        print(colored('*', 'grey'), end='')
-                    elif 'locked' in class_:
-                        print(' ', end='')
-
-                print(f' {name}', end=' ')
-                print(f'({colored(name_link, "blue")})' if name_link is not None else '')
-
-            print()
-            print(f'({colored("*", "yellow")} 2 stars) '
-                  f'({colored("*", "cyan")} 1 star) '
-                  f'({colored("*", "grey")} 0 stars)\n')
+    if conf.private_leaderboards:
+        # boards are fetched and parsed concurrently, but map() hands them back in the
+        # configured order, so each is printed once it and every board before it is ready
+        with futures.ThreadPoolExecutor(conf.max_concurrency) as executor:
+            boards = executor.map(lambda board_id: fetch_private_leaderboard(year, board_id),
+                                  conf.private_leaderboards)
+            for board_id, board in zip(conf.private_leaderboards, boards):
+                if board is None:
+                    print(colored('Session cookie is invalid or expired.', 'red'))
+                    return
+                print_private_leaderboard(board_id, board)
     else:
         print(colored('You are not a member of any private leaderboards '
                       'or you have not configured them.', 'red'))
         print(colored('Set the environment variable ADVENT_PRIV_BOARDS to '
                       'a comma-separated list of private leaderboard IDs.', 'red'))
 
-def check_and_print_result(part, solution, time, expected):
+def check_and_print_result(part, solution, time, expected, phase=None):
     if solution is None:
         return False
     
@@ -312,7 +374,12 @@ def check_and_print_result(part, solution, time, expected):
     else:
         color = "magenta"
     failed = False
-    print(f'{colored("Part {} (Time: {}ms):".format(part, time), color)} {solution}')
+    stats = f'Time: {time}ms'
+    if phase is not None and phase.peak_bytes is not None:
+        stats += (f', Peak: {format_bytes(phase.peak_bytes)}'
+                  f', Net: {format_bytes(phase.net_bytes)}'
+                  f', Max RSS: {format_bytes(phase.max_rss_bytes or 0)}')
+    print(f'{colored("Part {} ({}):".format(part, stats), color)} {solution}')
     if expected is not None:
         if expected == str(solution):
             print(f'{colored("Part {} Output {} matches expected {}".format(part, solution, expected), "green")}')
@@ -321,17 +388,120 @@ def check_and_print_result(part, solution, time, expected):
             print(f'{colored("Part {} Output {} does NOT match expected {}".format(part, solution, expected), "red")}')
     return failed
 
-def check_and_print_results(solution1, time1, expected1, solution2, time2, expected2):
+def check_and_print_results(solution1, time1, expected1, solution2, time2, expected2,
+                            recorder=None, run_status=None, message=None):
+    if run_status is not None and run_status != RunStatus.OK:
+        print(colored(f'{run_status.name}: {message}' if message else run_status.name, 'red'))
+        return True
     if solution1 is None and solution2 is None:
         print(colored('No solution implemented', 'red'))        
         return True
+    phase1 = recorder.get('part1') if recorder is not None else None
+    phase2 = recorder.get('part2') if recorder is not None else None
     failed = False
-    failed = failed or check_and_print_result(1, solution1, time1, expected1)
-    failed = failed or check_and_print_result(2, solution2, time2, expected2)    
+    failed = failed or check_and_print_result(1, solution1, time1, expected1, phase1)
+    failed = failed or check_and_print_result(2, solution2, time2, expected2, phase2)    
     
     return failed
 
-def test(year, day, solution_file='solution', example=False, part='0'):
+
+PHASE_LABELS = {
+    'import': 'Import solution',
+    'restore': 'Restore Puzzle',
+    'read_input': 'Read input',
+    'construct': 'Construct Puzzle',
+    'snapshot': 'Snapshot Puzzle',
+    'part1': 'Part 1',
+    'part2': 'Part 2',
+}
+
+
+def print_phase_breakdown(recorder):
+    if not recorder.phases:
+        return
+    headers = ['Phase', 'Wall', 'CPU']
+    if recorder.memory:
+        headers += ['Peak', 'Net', 'Max RSS']
+    rows = []
+    for phase in recorder.phases:
+        row = [PHASE_LABELS.get(phase.name, phase.name),
+               benchmark.format_ns(phase.wall_ns), benchmark.format_ns(phase.cpu_ns)]
+        if recorder.memory:
+            row += [format_bytes(phase.peak_bytes), format_bytes(phase.net_bytes),
+                    format_bytes(phase.max_rss_bytes) if phase.max_rss_bytes else '-']
+        rows.append(row)
+    print()
+    table = tabulate.tabulate(rows, headers=headers,
+                              colalign=('left',) + ('right',) * (len(headers) - 1))
+    print(colored(table, 'grey'))
+
+
+def save_profiles(year, day, solution_file, recorder, top=15):
+    for name, profiler in recorder.profiles.items():
+        path = f'{year}/{day}/{solution_file}.{name}.prof'
+        profiler.dump_stats(path)
+        print()
+        print(colored(f'{PHASE_LABELS.get(name, name)}: top {top} functions by own time '
+                      f'(saved to {path})', 'yellow'))
+        print(profiling.format_top(profiler, top))
+
+    for name, sampler in recorder.samplers.items():
+        path = f'{year}/{day}/{solution_file}.{name}.collapsed'
+        sampler.write_collapsed(path)
+        print(colored(f'Saved collapsed stacks for {PHASE_LABELS.get(name, name)} to {path}',
+                      'grey'))
+
+
+def check_solution_exists(year, day, solution_file='solution'):
+    if not os.path.exists(f'{year}/{day}/'):
+        print(colored('Directory does not exist:', 'red'))
+        print(colored(f'  "{os.getcwd()}/{year}/{day}/"', 'red'))
+        return False
+
+    if solution_file != 'solution':
+        if not os.path.exists(f'{year}/{day}/{solution_file}.py'):
+            print(colored('Solution file does not exist:', 'red'))
+            print(colored(f'  "{os.getcwd()}/{year}/{day}/{solution_file}.py"', 'red'))
+            return False
+        print(colored(f'(Using {solution_file}.py)', 'red'))
+    return True
+
+
+def run_solution(year, day, input, solution_file='solution', part=0, recorder=None,
+                 parallel_parts=False, timeout=None, memory_limit=None, memoize=False):
+    # an unchanged solution on an unchanged input gives the answers it gave last time
+    key = memo.answer_key(year, day, solution_file, input.path) if memoize else None
+    cached = memo.lookup(key, part) if key else None
+    if cached is not None:
+        *answers, stored_at = cached
+        stored = dt.fromtimestamp(stored_at).strftime('%Y-%m-%d %H:%M:%S')
+        print(colored(f'Unchanged since {stored}, using saved answers '
+                      f'({solution_file}.py, --force to re-run)', 'grey'))
+        return (*answers, RunStatus.OK, None)
+
+    if timeout or memory_limit:
+        result = runner.run_sandboxed(year, day, input, solution_file=solution_file, part=part,
+                                      recorder=recorder, timeout=timeout,
+                                      memory_limit=memory_limit and memory_limit * 1024 * 1024)
+        answers = (result.part1, result.part2, result.part1_ms, result.part2_ms)
+        status, message = result.status, result.message
+    elif parallel_parts and part == 0:
+        answers = runner.compute_answers_parallel(year, day, input,
+                                                  solution_file=solution_file,
+                                                  recorder=recorder)
+        status, message = RunStatus.OK, None
+    else:
+        answers = compute_answers(year, day, input, solution_file=solution_file, part=part,
+                                  recorder=recorder)
+        status, message = RunStatus.OK, None
+    if key and status == RunStatus.OK:
+        memo.store(key, *answers, part=part)
+    return (*answers, status, message)
+
+
+def test(year, day, solution_file='solution', example=False, part='0', profile=False,
+         profile_top=15, flamegraph=False, memory=False, fail_fast=False,
+         parallel_parts=False, timeout=None, memory_limit=None, force=False):
     if (year == None):
         year = get_year()
     if (day == None):
@@ -343,149 +513,257 @@ def test(year, day, solution_file='solution', example=False, part='0'):
         print("\tTesting all parts")
     else:
         print("\tTesting part", part)
-    
 
-    if not os.path.exists(f'{year}/{day}/'):
-        print(colored('Directory does not exist:', 'red'))
-        print(colored(f'  "{os.getcwd()}/{year}/{day}/"', 'red'))
+    if not check_solution_exists(year, day, solution_file):
         return
 
-    if solution_file != 'solution':
-        if not os.path.exists(f'{year}/{day}/{solution_file}.py'):
-            print(colored('Solution file does not exist:', 'red'))
-            print(colored(f'  "{os.getcwd()}/{year}/{day}/{solution_file}.py"', 'red'))
-            return
-        print(colored(f'(Using {solution_file}.py)', 'red'))
+    if example and (profile or flamegraph):
+        print(colored('Profiling is only available without --example.', 'grey'))
+    if example and (timeout or memory_limit):
+        print(colored('Time and memory limits are only applied without --example.', 'grey'))
+    sandboxed = timeout or memory_limit
+    if sandboxed and (profile or flamegraph):
+        print(colored('Profiling is not available with --timeout or --memory-limit.', 'grey'))
+        profile = flamegraph = False
+    if parallel_parts and (profile or flamegraph or sandboxed):
+        print(colored('Profiling and limits run the parts one after another, '
+                      'ignoring --parallel-parts.', 'grey'))
+        parallel_parts = False
 
     if not example:
 
-        with open(f'{year}/{day}/input.txt', 'r') as f:
-            input = [
-                line.replace('\r', '').replace('\n', '') for line in f.readlines()
-            ]
-        part1_answer, part2_answer, part1_time, part2_time = compute_answers(year, day, input,
-                                                    solution_file=solution_file,
-                                                    example=example, part=part)
+        recorder = PhaseRecorder(profile=profile, sample_stacks=flamegraph, memory=memory)
+        input = input_file(year, day)
+        # profiling and memory runs are about the measurements, not the answers
+        memoize = not (force or profile or flamegraph or memory)
+        part1_answer, part2_answer, part1_time, part2_time, run_status, message = run_solution(
+            year, day, input, solution_file=solution_file, part=part, recorder=recorder,
+            parallel_parts=parallel_parts, timeout=timeout, memory_limit=memory_limit,
+            memoize=memoize
+        )
         part1_expected, part2_expected = get_expected_from_from_saved(year, day)
-        check_and_print_results(part1_answer, part1_time, part1_expected, part2_answer, part2_time, part2_expected)
+        check_and_print_results(part1_answer, part1_time, part1_expected, part2_answer, part2_time, part2_expected,
+                                recorder=recorder, run_status=run_status, message=message)
+        print_phase_breakdown(recorder)
+        save_profiles(year, day, solution_file, recorder, profile_top)
 
     else:
-        path = f'{year}/{day}/'
-        failed = False
-
-        for filename in os.listdir(path):
-            if filename.startswith("test_part1_"):
-                if part == 2:
-                    continue
-                test_part = 1
-            elif filename.startswith("test_part2_"):
-                if part == 1:
+        cases = runner.example_cases(year, day, part)
+        case_results = {}
+        # cases run concurrently but are printed in file name order once they are all done.
+        # with fail_fast, cases that haven't started yet are cancelled after the first failure
+        workers = max(1, min(len(cases), os.cpu_count() or 1))
+        with futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            submitted = [executor.submit(runner.run_example, year, day, filename, test_part,
+                                         solution_file)
+                         for filename, test_part in cases]
+            for future in futures.as_completed(submitted):
+                if future.cancelled():
                     continue
-                test_part = 2
-            else:
-                continue
+                result = future.result()
+                case_results[result.filename] = result
+                if fail_fast and runner.example_failed(result):
+                    for pending in submitted:
+                        pending.cancel()
 
+        failed = False
+        for filename, test_part in cases:
+            if filename not in case_results:
+                print(colored(f'Skipped test input file {filename}', 'grey'))
+                continue
+            result = case_results[filename]
             print(f'{colored("Executing with test input file {}".format(filename), "yellow")}')
+            print(result.output, end='')
+            if result.error is not None:
+                print(colored(f'Part {test_part} raised {result.error}', 'red'))
+                failed = True
+            elif test_part == 1:
+                failed |= check_and_print_results(result.answer, result.time, result.expected,
+                                                  None, 0, None)
+            else:
+                failed |= check_and_print_results(None, 0, None,
+                                                  result.answer, result.time, result.expected)
 
-            with open(f'{year}/{day}/{filename}', 'r') as f:
-                lines = f.readlines()                
-                lines.pop(0)
-                expected_result = lines.pop(0).strip()
-                if test_part == 1:
-                    expected_result1 = expected_result
-                    expected_result2 = None
-                else:
-                    expected_result2 = expected_result
-                    expected_result1 = None
-                
-                lines.pop(0)
-                                
-                input = [line.replace('\r', '').replace('\n', '') for line in lines]
-                                
-                part1_answer, part2_answer, part1_time, part2_time = compute_answers(year, day, input,
-                                                    solution_file=solution_file,
-                                                    example=example,
-                                                    part = test_part)
-                if (check_and_print_results(part1_answer, part1_time, expected_result1, part2_answer, part2_time, expected_result2)):
-                    failed = True
-                        
         if failed:
             print(colored('!!!!!TEST FAILED!!!!!', 'red'))
         else:
             print(colored('*****ALL TESTS PASSED*****', 'green'))
 
-
-    if solution_file != 'solution':
-        part1_answer_orig, part2_answer_orig, part1_time_orig, part2_time_orig = compute_answers(year, day, example=example)
-        if part1_answer == part1_answer_orig and part2_answer == part2_answer_orig:
+    if solution_file != 'solution' and not example \
+            and os.path.exists(f'{year}/{day}/solution.py'):
+        part1_answer_orig, part2_answer_orig, *_ = run_solution(
+            year, day, input, part=part, recorder=PhaseRecorder(), memoize=not force
+        )
+        # saved answers come back as strings
+        if (str(part1_answer), str(part2_answer)) == (str(part1_answer_orig),
+                                                      str(part2_answer_orig)):
             print(colored('Output matches solution.py', 'green'))
         else:
             print(colored('Output does not match solution.py', 'red'))
 
-def record_result(year, day, success, part, solution, time):
-    date = dt.now().strftime("%Y-%m-%d %H:%M:%S")
-    if success:
-        with open(f'{year}/{day}/correct_results.txt', 'a') as f:            
-                f.write(f'Puzzle {year}/{day} Part {part} : Result for {date}\n')
-                f.write(f'Part{part} Answer: {solution}\n')
-                f.write(f'Execution Time: {time}ms\n\n')
-                f.close()  
-    else:
-         with open(f'{year}/{day}/incorrect_results.txt', 'a') as f:                
-                f.write(f'Puzzle {year}/{day} Part {part} : Failed Result for {date}\n')
-                f.write(f'Part{part} Incorrect Answer: {solution}\n')
-                f.write(f'Execution Time: {time}ms\n\n')
-                f.close()
 
-def save_results_from_prompt(year, day):
-    
-    if not os.path.exists(f'{year}/{day}/prompt_results.txt'):
-        conf = config.get_config()
-        r = requests.get(f'https://adventofcode.com/{year}/day/{int(day)}',
-                    cookies={'session': conf['session_cookie']})
-
-        soup = BeautifulSoup(r.text, 'html.parser')
-        with open(f'{year}/{day}/prompt_results.txt', 'w') as f:
-            date = dt.now().strftime("%Y-%m-%d %H:%M:%S")
-            f.write(f'Puzzle {year}/{day} : Correct Answers retrieved from prompt on {date}\n')            
-            ps = soup.find_all('p')
-            part_id = 1
-            for p in ps:            
-                line = p.decode_contents()
-                if "Your puzzle answer was" in line:
-                    f.write(f"Part{part_id}: {line}\n")                    
-                    part_id += 1
-
-            f.write("\n\n")     
-            f.close()   
-
-answer_re = re.compile(r'<code>(.*?)</code>')
+def watch_test(year, day, solution_file='solution', example=False, **kwargs):
+    if year is None:
+        year = get_year()
+    if day is None:
+        day = get_day()
+
+    # the interpreter and everything it imported stay loaded between runs, only the
+    # solution modules that changed on disk are reloaded
+    run = True
+    while True:
+        if run:
+            # a broken solution is what watching is for, report it and keep going
+            try:
+                test(year, day, solution_file=solution_file, example=example, **kwargs)
+            except Exception:
+                traceback.print_exc()
+        print(colored(f'\nWatching {year}/{day} for changes, press Ctrl+C to stop.', 'grey'))
+        try:
+            changed = watch.wait_for_changes(year, day, example)
+        except KeyboardInterrupt:
+            return
+        print(colored(f'\nChanged: {", ".join(os.path.basename(path) for path in changed)}',
+                      'grey'))
+        try:
+            reloaded = watch.reload_modules(year, day, changed)
+        except Exception:
+            # the old code is still loaded, running it would only repeat the last result
+            traceback.print_exc()
+            run = False
+            continue
+        run = True
+        if reloaded:
+            print(colored(f'Reloaded: {", ".join(reloaded)}', 'grey'))
+
+
+def format_day_part(answer, expected, time, error):
+    if answer is None:
+        return colored('error', 'red') if error else colored('-', 'grey')
+    if expected is None:
+        return colored(f'unverified {time}ms', 'yellow')
+    if expected == str(answer):
+        return colored(f'pass {time}ms', 'green')
+    return colored(f'FAIL {time}ms (got {answer}, expected {expected})', 'red')
+
+
+def run_days(year, days, solution_file='solution'):
+    # every day gets a fresh worker process, so solutions can't leak state (modules,
+    # recursion limits, globals) into each other
+    with multiprocessing.Pool(min(len(days), os.cpu_count() or 1),
+                              maxtasksperchild=1) as pool:
+        return pool.starmap(runner.run_day, [(year, day, solution_file) for day in days])
+
+
+def test_all(year, solution_file='solution'):
+    if not year:
+        year = get_year()
+
+    days = runner.solved_days(year, solution_file)
+    if not days:
+        print(colored(f'No days of {year} have a {solution_file}.py and input.txt.', 'red'))
+        return
+    print(colored(f'Testing {len(days)} day(s) of {year}', 'yellow'))
+
+    start = time.perf_counter_ns()
+    day_results = run_days(year, days, solution_file)
+    wall_ns = time.perf_counter_ns() - start
+
+    # one query for the whole year rather than one per day
+    expected = results.expected_answers_for_year(year)
+    rows = []
+    failed = []
+    for result in day_results:
+        part1_expected, part2_expected = expected.get(result.day, (None, None))
+        if result.error or any(
+            answer is not None and expected is not None and expected != str(answer)
+            for answer, expected in ((result.part1, part1_expected),
+                                     (result.part2, part2_expected))
+        ):
+            failed.append(result)
+        rows.append([
+            f'{year}/{result.day}',
+            format_day_part(result.part1, part1_expected, result.part1_ms, result.error),
+            format_day_part(result.part2, part2_expected, result.part2_ms, result.error),
+            benchmark.format_ns(result.wall_ns)
+        ])
+    print(tabulate.tabulate(rows, headers=['Day', 'Part 1', 'Part 2', 'Total']))
+
+    for result in day_results:
+        if result.error:
+            print(colored(f'{year}/{result.day}: {result.error}', 'red'))
+
+    serial_ns = sum(result.wall_ns for result in day_results)
+    print()
+    print(colored(f'{len(day_results) - len(failed)}/{len(day_results)} day(s) passed in '
+                  f'{benchmark.format_ns(wall_ns)} (serial: {benchmark.format_ns(serial_ns)}, '
+                  f'{serial_ns / wall_ns:.1f}x speedup)', 'red' if failed else 'green'))
+
+
+def bench(year, day, solution_file='solution', part='0', repeat=10, warmup=1, min_time=0.2,
+          low_noise=False):
+    if low_noise:
+        benchmark.ensure_fixed_hash_seed()
+
+    part = int(part)
+    if year is None:
+        year = get_year()
+    if day is None:
+        day = get_day()
+
+    print(colored(f"Benchmarking {year}/{day}", "yellow"))
+    if not check_solution_exists(year, day, solution_file):
+        return
+
+    solution = load_solution(year, day, solution_file)
+    input = inputs.for_puzzle(input_file(year, day), solution.Puzzle)
+
+    rows = []
+    with benchmark.low_noise() if low_noise else nullcontext():
+        for bench_part in (1, 2) if part == 0 else (part,):
+            number, summary = benchmark.benchmark_part(
+                lambda: solution.Puzzle(input, False), bench_part,
+                repeat=repeat, warmup=warmup, min_time=min_time
+            )
+            rows.append([
+                colored(f'Part {bench_part}', 'cyan' if bench_part == 1 else 'magenta'),
+                number, repeat,
+                *[benchmark.format_ns(summary[k]) for k in ('min', 'median', 'p95', 'stddev')]
+            ])
+
+    print(tabulate.tabulate(rows, stralign='right',
+                            headers=['', 'Loops', 'Runs', 'Min', 'Median', 'p95', 'Stddev']))
+    if low_noise:
+        print(colored('(low noise: gc disabled, PYTHONHASHSEED=0, pinned to one cpu)', 'grey'))
+
+
+def record_result(year, day, success, part, solution, time, solution_hash=None, bound=None):
+    verdict = results.CORRECT if success else results.INCORRECT
+    results.record(year, day, part, solution, verdict, time_ms=time,
+                   solution_hash=solution_hash, bound=bound)
+
+
+def save_results_from_prompt(year, day, page=None):
+    # the page only shows an answer under each part once it is solved, so it is fetched
+    # until every part has one. day 25 has no answer for part 2
+    saved = results.prompt_parts(year, day)
+    if saved >= ({1} if int(day) == 25 else {1, 2}):
+        return
+    if page is None:
+        r = client.get(f'https://adventofcode.com/{year}/day/{int(day)}')
+        page = parse_day_page(r.text)
+    for part_id, answer in enumerate(page.answers, start=1):
+        if part_id not in saved:
+            results.record(year, day, part_id, answer, results.PROMPT)
+
+
 def get_expected_from_from_saved(year, day):
-    part1_answer = None
-    part2_answer = None
-    if os.path.exists(f'{year}/{day}/prompt_results.txt'):
-        with open(f'{year}/{day}/prompt_results.txt', 'r') as f:
-            lines = f.readlines()
-            for line in lines:
-                if f"Part1" in line:
-                    part1_answer = answer_re.findall(line)[0]
-                elif f"Part2" in line:
-                    part2_answer = answer_re.findall(line)[0]
-
-    elif os.path.exists(f'{year}/{day}/correct_results.txt'):
-        with open(f'{year}/{day}/correct_results.txt', 'r') as f:
-            lines = f.readlines()
-            for line in lines:
-                if f"Part1" in line:
-                    part1_answer = line.split(":")[1].strip()
-                elif f"Part2" in line:
-                    part2_answer = line.split(":")[1].strip()
-                    
-    return part1_answer, part2_answer
+    return results.expected_answers(year, day)
     
 
 
-def submit(year, day, solution_file='solution', part='0'):
+def submit(year, day, solution_file='solution', part='0', memory=False, timeout=None,
+           memory_limit=None, force=False):
     # TODO: Check for previous failure or success
 
     part = int(part)
@@ -496,74 +774,83 @@ def submit(year, day, solution_file='solution', part='0'):
 
     print(colored(f"Submit {year}/{day}", "yellow"))    
 
-    if not os.path.exists(f'{year}/{day}/'):
-        print(colored('Directory does not exist:', 'red'))
-        print(colored(f'  "{os.getcwd()}/{year}/{day}/"', 'red'))
+    if not check_solution_exists(year, day, solution_file):
         return
 
-    if solution_file != 'solution':
-        if not os.path.exists(f'{year}/{day}/{solution_file}.py'):
-            print(colored('Solution file does not exist:', 'red'))
-            print(colored(f'  "{os.getcwd()}/{year}/{day}/{solution_file}.py"', 'red'))
-            return
-        print(colored(f'(Using {solution_file}.py)', 'red'))
-
-    with open(f'{year}/{day}/input.txt', 'r') as f:
-        input = [
-            line.replace('\r', '').replace('\n', '') for line in f.readlines()
-        ]
+    recorder = PhaseRecorder(memory=memory)
+    input = input_file(year, day)
+    solution_hash = memo.answer_key(year, day, solution_file, input.path)
 
-    part1_answer, part2_answer, part1_time, part2_time = compute_answers(year, day, input, solution_file=solution_file, part=part)
+    part1_answer, part2_answer, part1_time, part2_time, run_status, message = run_solution(
+        year, day, input, solution_file=solution_file, part=part, recorder=recorder,
+        timeout=timeout, memory_limit=memory_limit, memoize=not (force or memory)
+    )
     part1_expected, part2_expected = get_expected_from_from_saved(year, day)
-    check_and_print_results(part1_answer, part1_time, part1_expected, part2_answer, part2_time, part2_expected)
+    check_and_print_results(part1_answer, part1_time, part1_expected, part2_answer, part2_time, part2_expected,
+                            recorder=recorder, run_status=run_status, message=message)
+    print_phase_breakdown(recorder)
+    if run_status != RunStatus.OK:
+        return
     
-    status, response = None, None
     if part2_answer is not None:
-        print('Submitting part 2...')
-        status, response = submit_answer(year, day, 2, part2_answer)
+        send_answer(year, day, 2, part2_answer, part2_time, solution_hash)
     elif part1_answer is not None:
-        print('Submitting part 1...')
-        status, response = submit_answer(year, day, 1, part1_answer)
+        send_answer(year, day, 1, part1_answer, part1_time, solution_hash)
     else:
         print(colored('No solution implemented', 'red'))
-        return
+
+
+def submit_and_wait(year, day, part, answer, max_waits=5):
+    # a lockout says how long it has left, sleep through it and try again
+    for _ in range(max_waits):
+        status, response = submit_answer(year, day, part, answer)
+        if status != Status.RATE_LIMIT or response is None:
+            break
+        print(colored(f'Rate limited, retrying in {response}s...', 'yellow'))
+        time.sleep(response + 1)
+    return status, response
+
+
+def send_answer(year, day, part, answer, elapsed, solution_hash=None):
+    # every wrong submission locks you out for a while, don't spend one on a known answer
+    reason = results.known_wrong(year, day, part, answer)
+    if reason:
+        print(colored(f'Not submitting part {part}: {reason}.', 'red'))
+        return None
+    print(f'Submitting part {part}...')
+    status, response = submit_and_wait(year, day, part, answer)
 
     if status == Status.PASS:
         print(colored('Correct!', 'green'), end=' ')
-        if part2_answer is not None:
+        if part == 2:
             print(colored('**', 'yellow'))
             print(f'Day {int(day)} complete!')
-            record_result(year, day, True, 2, part2_answer, part2_time)
-            save_results_from_prompt(year, day)
+            record_result(year, day, True, 2, answer, elapsed, solution_hash)
+            # the accepted answer is already known, the page is only needed for part 1's
+            if results.expected_answers(year, day)[0] is None:
+                save_results_from_prompt(year, day)
             
-        elif part1_answer is not None:
+        else:
             print(colored('*', 'cyan'))
           
-            record_result(year, day, True, 1, part1_answer, part1_time)
-            conf = config.get_config()
-            r = requests.get(f'https://adventofcode.com/{year}/day/{int(day)}',
-                             cookies={'session': conf['session_cookie']})
-            soup = BeautifulSoup(r.text, 'html.parser')
-            part2_html = soup.find_all('article', class_='day-desc')[1].decode_contents()
-
-            # remove hyphens from title sections, makes markdown look nicer
-            part2_html = re.sub('--- (.*) ---', r'\1', part2_html)
-
-            # also makes markdown look better
-            #part2_html = part2_html.replace('\n\n', '\n')
-
-            with open(f'{year}/{day}/prompt.md', 'a') as f:
-                f.write(custom_markdownify(part2_html))
-            print(f'Appended part 2 prompt to {year}/{day}/prompt.md')
+            record_result(year, day, True, 1, answer, elapsed, solution_hash)
+            # one fetch of the page gives both the part 2 prompt and part 1's answer
+            r = client.get(f'https://adventofcode.com/{year}/day/{int(day)}')
+            page = parse_day_page(r.text)
+            if len(page.parts) > 1:
+                # rewritten from the page, so submitting again can't repeat part 2
+                with open(f'{year}/{day}/prompt.md', 'w') as f:
+                    f.write(''.join(part_markdown(part_html) for part_html in page.parts))
+                print(f'Added part 2 prompt to {year}/{day}/prompt.md')
+            save_results_from_prompt(year, day, page)
 
     elif status == Status.FAIL:
-        print(colored('Incorrect!', 'red'))
-        if part2_answer is not None:
-            record_result(year, day, False, 2, part2_answer, part2_time)
-            
-        elif part1_answer is not None:
+        # response is 'high' or 'low' if adventofcode.com said so
+        print(colored('Incorrect!', 'red')
+              + (f' Your answer is too {response}.' if response else ''))
+        if part == 1:
             print(colored('*', 'cyan'))
-            record_result(year, day, False, 1, part1_answer, part1_time)
+        record_result(year, day, False, part, answer, elapsed, solution_hash, response)
 
     elif status == Status.RATE_LIMIT:
         print(colored('Rate limited! Please wait before submitting again.', 'yellow'))
@@ -579,6 +866,71 @@ def submit(year, day, solution_file='solution', part='0'):
         print(colored('Something went wrong. Please view the output below:', 'red'))
         print(response)
 
+    return status
+
+
+def submit_all_pending(year, solution_file='solution'):
+    if not year:
+        year = get_year()
+
+    # days with a part that hasn't been answered correctly yet
+    expected = results.expected_answers_for_year(year)
+    days = [day for day in runner.solved_days(year, solution_file)
+            if None in expected.get(day, (None, None))]
+    if not days:
+        print(colored(f'No days of {year} have answers left to submit.', 'yellow'))
+        return
+    print(colored(f'Computing answers for {len(days)} day(s) of {year}', 'yellow'))
+    day_results = run_days(year, days, solution_file)
+
+    queue = []
+    for result in day_results:
+        if result.error:
+            print(colored(f'{year}/{result.day}: {result.error}', 'red'))
+            continue
+        # part 2 only unlocks once part 1 is right, so that is sent first
+        part = 1 if expected.get(result.day, (None, None))[0] is None else 2
+        answer, elapsed = (result.part1, result.part1_ms) if part == 1 \
+            else (result.part2, result.part2_ms)
+        if answer is not None:
+            queue.append((result, part, answer, elapsed))
+    if not queue:
+        print(colored('No new answers to submit.', 'yellow'))
+        return
+
+    # one at a time, submit_and_wait sleeps through any lockout before the next one
+    for result, part, answer, elapsed in queue:
+        print()
+        print(colored(f'Submit {year}/{result.day}', 'yellow'))
+        solution_hash = memo.answer_key(year, result.day, solution_file,
+                                        input_file(year, result.day).path)
+        status = send_answer(year, result.day, part, answer, elapsed, solution_hash)
+        if status == Status.PASS and part == 1 and result.part2 is not None:
+            queue.append((result, 2, result.part2, result.part2_ms))
+
+
+def check_daemon_supported():
+    if not daemon.supported:
+        print(colored('advent daemon is not supported on this platform, it needs Unix '
+                      'sockets and fork.', 'red'))
+    return daemon.supported
+
+
+def start_daemon():
+    if not check_daemon_supported():
+        return
+    print(colored('Starting daemon, press Ctrl+C to stop.', 'yellow'))
+    daemon.serve()
+
+
+def stop_daemon():
+    if not check_daemon_supported():
+        return
+    if daemon.stop():
+        print(colored('Stopped daemon.', 'green'))
+    else:
+        print(colored('No daemon is running.', 'red'))
+
 
 def countdown(year, day):
 
@@ -596,7 +948,7 @@ def countdown(year, day):
         curses.cbreak()
         curses.halfdelay(2)
         curses.use_default_colors()
-        if config.get_config()['disable_color']:
+        if config.get_config().disable_color:
             for i in range(1, 4):
                 curses.init_pair(i, -1, -1)
         else:
@@ -2,35 +2,178 @@ import os
 import sys
 from termcolor import colored
 
+from .lazy import lazy_import
 
-def get_config():
+configparser = lazy_import('configparser')
+
+CONFIG_FILE = 'aoc_cli_config.ini'
+
+
+def read_settings(settings):
 
     config = {}
 
-    if 'ADVENT_PRIV_BOARDS' in os.environ:
-        config['private_leaderboards'] = os.environ['ADVENT_PRIV_BOARDS'].split(',')
+    if 'ADVENT_PRIV_BOARDS' in settings:
+        config['private_leaderboards'] = settings['ADVENT_PRIV_BOARDS'].split(',')
     else:
         config['private_leaderboards'] = []
 
-    if 'ADVENT_DISABLE_TERMCOLOR' in os.environ:
-        config['disable_color'] = (os.environ['ADVENT_DISABLE_TERMCOLOR'] == '1')
+    if 'ADVENT_DISABLE_TERMCOLOR' in settings:
+        config['disable_color'] = (settings['ADVENT_DISABLE_TERMCOLOR'] == '1')
     else:
         config['disable_color'] = False
 
-    if 'ADVENT_MARKDOWN_EM' in os.environ:
-        config['md_em'] = os.environ['ADVENT_MARKDOWN_EM']
+    if 'ADVENT_MARKDOWN_EM' in settings:
+        config['md_em'] = settings['ADVENT_MARKDOWN_EM']
     else:
         config['md_em'] = 'default'
 
-    if 'ADVENT_SESSION_COOKIE' in os.environ:
-        config['session_cookie'] = os.environ['ADVENT_SESSION_COOKIE']
+    if 'ADVENT_HTTP_TIMEOUT' in settings:
+        config['http_timeout'] = float(settings['ADVENT_HTTP_TIMEOUT'])
+    else:
+        config['http_timeout'] = 10.0
+
+    if 'ADVENT_HTTP_RETRIES' in settings:
+        config['http_retries'] = int(settings['ADVENT_HTTP_RETRIES'])
+    else:
+        config['http_retries'] = 3
+
+    if 'ADVENT_HTTP_BACKOFF' in settings:
+        config['http_backoff'] = float(settings['ADVENT_HTTP_BACKOFF'])
+    else:
+        config['http_backoff'] = 0.5
+
+    if 'ADVENT_HTTP_POOL_SIZE' in settings:
+        config['http_pool_size'] = int(settings['ADVENT_HTTP_POOL_SIZE'])
+    else:
+        config['http_pool_size'] = 10
+
+    if 'ADVENT_MAX_CONCURRENCY' in settings:
+        config['max_concurrency'] = max(1, int(settings['ADVENT_MAX_CONCURRENCY']))
+    else:
+        config['max_concurrency'] = 4
+
+    if 'ADVENT_RATE_LIMIT' in settings:
+        config['max_requests_per_second'] = float(settings['ADVENT_RATE_LIMIT'])
     else:
-        # this is to avoid importing colored() from utils.py, resulting in a circular import
-        error_message = ('Session cookie not set.\nGrab your AoC session cookie from a browser'
-                         ' and store it in an environment variable ADVENT_SESSION_COOKIE.')
-        if not config['disable_color']:
-            error_message = '\n'.join([colored(s, 'red') for s in error_message.split('\n')])
-        print(error_message)
-        sys.exit(1)
+        config['max_requests_per_second'] = 4.0
+
+    if 'ADVENT_CACHE_DIR' in settings:
+        config['cache_dir'] = settings['ADVENT_CACHE_DIR']
+    else:
+        cache_home = settings.get('XDG_CACHE_HOME', os.path.expanduser('~/.cache'))
+        config['cache_dir'] = os.path.join(cache_home, 'advent-cli')
+
+    if 'ADVENT_CACHE_SIZE' in settings:
+        config['cache_size'] = int(float(settings['ADVENT_CACHE_SIZE']) * 1024 * 1024)
+    else:
+        config['cache_size'] = 50 * 1024 * 1024
+
+    if 'ADVENT_SNAPSHOT_CACHE_SIZE' in settings:
+        config['snapshot_cache_size'] = int(float(settings['ADVENT_SNAPSHOT_CACHE_SIZE'])
+                                            * 1024 * 1024)
+    else:
+        config['snapshot_cache_size'] = 200 * 1024 * 1024
+
+    if 'ADVENT_RESULTS_DB' in settings:
+        config['results_db'] = settings['ADVENT_RESULTS_DB']
+    else:
+        config['results_db'] = 'aoc_cli_results.db'
+
+    if 'ADVENT_HTML_PARSER' in settings:
+        config['html_parser'] = settings['ADVENT_HTML_PARSER']
+    else:
+        config['html_parser'] = None
+
+    if 'ADVENT_DAEMON_SOCKET' in settings:
+        config['daemon_socket'] = settings['ADVENT_DAEMON_SOCKET']
+    else:
+        config['daemon_socket'] = os.path.join(config['cache_dir'], 'daemon.sock')
+
+    if 'ADVENT_DAEMON_PRELOAD' in settings:
+        config['daemon_preload'] = [name for name in
+                                    settings['ADVENT_DAEMON_PRELOAD'].split(',') if name]
+    else:
+        config['daemon_preload'] = []
+
+    if 'ADVENT_NO_CACHE' in settings:
+        config['cache_enabled'] = (settings['ADVENT_NO_CACHE'] != '1')
+    else:
+        config['cache_enabled'] = True
+
+    config['cache_refresh'] = False
+
+    if 'ADVENT_YEAR' in settings:
+        config['year'] = settings['ADVENT_YEAR']
+    else:
+        config['year'] = None
+
+    if 'ADVENT_DAY' in settings:
+        config['day'] = settings['ADVENT_DAY']
+    else:
+        config['day'] = None
+
+    # only checked when something reads it, so offline commands work without a cookie
+    config['_session_cookie'] = settings.get('ADVENT_SESSION_COOKIE')
 
     return config
+
+
+def read_file(path=CONFIG_FILE):
+    parser = configparser.ConfigParser()
+    parser.read(path)
+    # keys are the environment variable names without the prefix, e.g. cache_dir or year
+    return {f'ADVENT_{key.upper()}': value for key, value in parser['DEFAULT'].items()}
+
+
+def save_file(path=CONFIG_FILE, **values):
+    parser = configparser.ConfigParser()
+    parser.read(path)
+    parser['DEFAULT'].update(values)
+    with open(path, 'w') as f:
+        parser.write(f)
+    invalidate()
+
+
+class Config:
+
+    def __init__(self, environ, file_settings=None, overrides=None):
+        # later layers win: the environment, then aoc_cli_config.ini, then the command line
+        self.__dict__.update(read_settings({**environ, **(file_settings or {})}))
+        self.__dict__.update(overrides or {})
+
+    @property
+    def session_cookie(self):
+        if self._session_cookie is None:
+            # colored() from termcolor, utils.py would be a circular import
+            error_message = ('Session cookie not set.\nGrab your AoC session cookie from a'
+                             ' browser and store it in an environment variable'
+                             ' ADVENT_SESSION_COOKIE.')
+            if not self.disable_color:
+                error_message = '\n'.join([colored(s, 'red')
+                                           for s in error_message.split('\n')])
+            print(error_message)
+            sys.exit(1)
+        return self._session_cookie
+
+
+# built on first use and kept until invalidate(), printing shouldn't re-read the environment
+_config = None
+overrides = {}
+
+
+def get_config():
+    global _config
+    if _config is None:
+        _config = Config(os.environ, read_file(), overrides)
+    return _config
+
+
+def invalidate():
+    global _config
+    _config = None
+
+
+def override(**values):
+    overrides.update(values)
+    invalidate()
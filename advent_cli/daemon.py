@@ -0,0 +1,186 @@
+import array
+import importlib
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import traceback
+
+from . import config
+
+
+STDIO_FDS = (0, 1, 2)
+
+# the daemon needs unix sockets and fork, neither of which exist on windows
+supported = hasattr(socket, 'AF_UNIX') and hasattr(os, 'fork')
+
+# set in the forked child that runs a forwarded command, so it doesn't forward it again
+serving = False
+
+
+def socket_path():
+    return config.get_config().daemon_socket
+
+
+def pid_path():
+    return os.path.splitext(socket_path())[0] + '.pid'
+
+
+def connect():
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path())
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def read_line(sock, buffer=b''):
+    while b'\n' not in buffer:
+        data = sock.recv(4096)
+        if not data:
+            return None, buffer
+        buffer += data
+    line, _, buffer = buffer.partition(b'\n')
+    return line.decode(), buffer
+
+
+def forward(argv):
+    # returns the exit code of the command run by the daemon, or None to run it locally
+    if serving or not supported:
+        return None
+    sock = connect()
+    if sock is None:
+        return None
+
+    with sock:
+        # the daemon writes straight to our terminal through these file descriptors
+        header = json.dumps({'argv': argv, 'cwd': os.getcwd(), 'env': dict(os.environ)})
+        sock.sendmsg([header.encode() + b'\n'],
+                     [(socket.SOL_SOCKET, socket.SCM_RIGHTS, array.array('i', STDIO_FDS))])
+        pid, buffer = read_line(sock)
+        if pid is None:
+            return None
+        try:
+            code, _ = read_line(sock, buffer)
+        except KeyboardInterrupt:
+            os.kill(int(pid), signal.SIGINT)
+            code, _ = read_line(sock, buffer)
+    return int(code) if code else 1
+
+
+def receive_request(sock):
+    fds = array.array('i')
+    data, ancdata, _, _ = sock.recvmsg(65536, socket.CMSG_SPACE(len(STDIO_FDS) * fds.itemsize))
+    for level, kind, payload in ancdata:
+        if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+            fds.frombytes(payload[:len(payload) - len(payload) % fds.itemsize])
+    header, _ = read_line(sock, data)
+    return json.loads(header), list(fds)
+
+
+def run_request(sock):
+    global serving
+    serving = True
+    request, fds = receive_request(sock)
+    for fd, target in zip(fds, STDIO_FDS):
+        os.dup2(fd, target)
+        os.close(fd)
+    # the streams were set up for wherever the daemon was started, rebuild them for the
+    # client's terminal (line buffered if it is one, with the client's color settings)
+    sys.stdin = open(0, 'r', closefd=False)
+    sys.stdout = open(1, 'w', buffering=1 if os.isatty(1) else -1, closefd=False)
+    sys.stderr = open(2, 'w', buffering=1, closefd=False)
+    os.chdir(request['cwd'])
+    os.environ.clear()
+    os.environ.update(request['env'])
+    # whatever the server loaded came from its own environment and directory
+    config.invalidate()
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    sock.sendall(f'{os.getpid()}\n'.encode())
+
+    from . import cli
+    code = 0
+    try:
+        sys.argv = ['advent'] + request['argv']
+        cli.main()
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            code = e.code or 0
+        else:
+            print(e.code, file=sys.stderr)
+            code = 1
+    except KeyboardInterrupt:
+        code = 130
+    except Exception:
+        traceback.print_exc()
+        code = 1
+    sys.stdout.flush()
+    sys.stderr.flush()
+    sock.sendall(f'{code}\n'.encode())
+
+
+class RequestHandler(socketserver.BaseRequestHandler):
+
+    def handle(self):
+        run_request(self.request)
+
+
+if supported:
+    class Server(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+        pass
+
+
+def preload(modules):
+    # everything imported here is shared with every forked run for free
+    from . import cli, lazy  # noqa: F401
+    lazy.load_all()
+    loaded = []
+    for name in modules:
+        try:
+            importlib.import_module(name)
+            loaded.append(name)
+        except ImportError:
+            print(f'Could not preload {name}', file=sys.stderr)
+    return loaded
+
+
+def serve():
+    path = socket_path()
+    sock = connect()
+    if sock is not None:
+        sock.close()
+        print(f'A daemon is already listening on {path}')
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if os.path.exists(path):
+        os.remove(path)
+
+    loaded = preload(config.get_config().daemon_preload)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    with open(pid_path(), 'w') as f:
+        f.write(str(os.getpid()))
+    try:
+        with Server(path, RequestHandler) as server:
+            print(f'Listening on {path}' + (f' (preloaded {", ".join(loaded)})'
+                                            if loaded else ''))
+            server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for leftover in (path, pid_path()):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+
+
+def stop():
+    try:
+        with open(pid_path()) as f:
+            pid = int(f.read())
+        os.kill(pid, signal.SIGTERM)
+    except (OSError, ValueError):
+        return False
+    return True
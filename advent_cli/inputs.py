@@ -0,0 +1,66 @@
+import mmap
+from collections import namedtuple
+
+
+# what a Puzzle can ask for with an input_mode class attribute, 'lines' when it doesn't
+INPUT_MODES = ('lines', 'iter', 'text', 'mmap')
+
+# the puzzle input on disk. it is opened in whatever form the solution wants only once
+# the solution is loaded, and it pickles as just the path for sandboxes and workers
+InputFile = namedtuple('InputFile', ['path'])
+
+
+class LineStream:
+
+    def __init__(self, path):
+        self.path = path
+
+    def __iter__(self):
+        # every loop opens the file again, so part 1 and part 2 each get their own pass
+        # and no more than one line is held at a time
+        with open(self.path, 'r') as f:
+            for line in f:
+                yield line.rstrip('\n')
+
+    def __repr__(self):
+        return f'LineStream({self.path!r})'
+
+
+def input_mode(puzzle):
+    mode = getattr(puzzle, 'input_mode', 'lines')
+    if mode not in INPUT_MODES:
+        raise ValueError(f'input_mode must be one of {", ".join(INPUT_MODES)}, not {mode!r}')
+    return mode
+
+
+def read_lines(path):
+    with open(path, 'r') as f:
+        return [line.rstrip('\n') for line in f]
+
+
+def map_file(path):
+    with open(path, 'rb') as f:
+        # mmap refuses empty files
+        if not f.seek(0, 2):
+            return memoryview(b'')
+        # the map stays open for as long as the memoryview is alive
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def for_puzzle(input, puzzle):
+    mode = input_mode(puzzle)
+    if isinstance(input, InputFile):
+        if mode == 'lines':
+            return read_lines(input.path)
+        elif mode == 'iter':
+            return LineStream(input.path)
+        elif mode == 'text':
+            with open(input.path, 'r') as f:
+                return f.read()
+        return map_file(input.path)
+
+    # example inputs are a handful of lines that are already in memory
+    if mode in ('lines', 'iter'):
+        return input
+    text = ''.join(f'{line}\n' for line in input)
+    return text if mode == 'text' else memoryview(text.encode())
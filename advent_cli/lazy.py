@@ -0,0 +1,49 @@
+import importlib
+import sys
+
+
+# lazily imported modules by name, so the daemon can load all of them up front
+modules = {}
+
+
+class LazyModule:
+
+    def __init__(self, name):
+        object.__setattr__(self, '_name', name)
+
+    def _load(self):
+        # import_module takes the import system's per-module lock, so threads racing to
+        # be first are safe, and after that it is a lookup in sys.modules
+        return importlib.import_module(self._name)
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    # so mock.patch through the proxy patches the real module everyone else sees
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __delattr__(self, attr):
+        delattr(self._load(), attr)
+
+    def __repr__(self):
+        return f'<lazy module {self._name!r}>'
+
+
+def lazy_import(name):
+    # returns a stand-in that imports the module on first attribute access.
+    # keeps startup fast for commands that never touch the heavy dependencies
+    if name in sys.modules:
+        return sys.modules[name]
+    if name not in modules:
+        modules[name] = LazyModule(name)
+    return modules[name]
+
+
+def load_all():
+    # loading a module can lazily import more, keep going until nothing is left
+    loaded = set()
+    while loaded != modules.keys():
+        for name in modules.keys() - loaded:
+            importlib.import_module(name)
+            loaded.add(name)
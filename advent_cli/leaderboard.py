@@ -0,0 +1,79 @@
+import json
+import re
+
+from collections import namedtuple
+
+from . import parsing
+from .utils import unlocked_days
+
+
+Board = namedtuple('Board', ['owner', 'members'])
+Member = namedtuple('Member', ['position', 'score', 'stars', 'name', 'link'])
+
+# per-day star states, stored as a 25 character string on each member
+LOCKED, NO_STARS, FIRST_ONLY, BOTH = ' ', '0', '1', '2'
+
+HTML_STAR_CLASSES = {
+    'privboard-star-both': BOTH,
+    'privboard-star-firstonly': FIRST_ONLY,
+    'privboard-star-unlocked': NO_STARS,
+    'privboard-star-locked': LOCKED,
+}
+
+
+def parse_json(text, year):
+    data = json.loads(text)
+    members = list(data['members'].values())
+    num_unlocked = unlocked_days(year)
+
+    def display_name(member):
+        return member['name'] or f'(anonymous user #{member["id"]})'
+
+    # same ordering as the site: local score, then whoever got their last star first
+    members.sort(key=lambda m: (-m['local_score'], m.get('last_star_ts') or 0, m['id']))
+    records = []
+    previous_score = None
+    for position, member in enumerate(members, start=1):
+        completed = member.get('completion_day_level', {})
+        stars = ''.join(
+            BOTH if '2' in completed.get(str(day), {})
+            else FIRST_ONLY if '1' in completed.get(str(day), {})
+            else NO_STARS if day <= num_unlocked
+            else LOCKED
+            for day in range(1, 26)
+        )
+        # like the html page, only the first of a tied score shows its position
+        tied = member['local_score'] == previous_score
+        previous_score = member['local_score']
+        records.append(Member(None if tied else position, member['local_score'], stars,
+                              display_name(member), member.get('link')))
+
+    owner = data['members'].get(str(data['owner_id']))
+    owner_name = display_name(owner) if owner else f'#{data["owner_id"]}'
+    return Board(owner_name, records)
+
+
+def parse_html(text):
+    soup = parsing.parse(text, parsing.LEADERBOARD_PAGE)
+
+    intro_text = soup.select('article p')[0].text
+    board_owner = soup.find('div', class_='user').contents[0].strip() \
+        if 'This is your' in intro_text \
+        else re.findall(r'private leaderboard of (.*) for', intro_text)[0]
+
+    records = []
+    for row in soup.find_all('div', class_='privboard-row')[1:]:
+        position = row.find('span', class_='privboard-position').text.strip(' )')
+        stars = ''.join(
+            HTML_STAR_CLASSES.get(span.attrs['class'][0], LOCKED)
+            for span in row.find_all('span', class_=re.compile('privboard-star-*'))
+        )
+        name_span = row.find('span', class_='privboard-name')
+        name = name_span.text
+        link = name_span.find('a')
+        name_link = link.attrs['href'] if link else None
+        score = row.find_all(string=True, recursive=False)[0].strip()
+        records.append(Member(int(position) if position else None, int(score), stars,
+                              name, name_link))
+
+    return Board(board_owner, records)
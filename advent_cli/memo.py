@@ -0,0 +1,90 @@
+import ast
+import hashlib
+import os
+import sys
+import time
+
+from . import results
+
+
+def _module_paths(name, package_dir):
+    # where a local import could live: next to the solution, or a module or package in
+    # the directory advent is run from. anything else is an installed library
+    relative = name.replace('.', '/')
+    return [os.path.join(package_dir, f'{relative}.py'),
+            os.path.join(package_dir, relative, '__init__.py'),
+            f'{relative}.py', os.path.join(relative, '__init__.py')]
+
+
+def local_imports(path):
+    with open(path, 'rb') as f:
+        tree = ast.parse(f.read())
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            # from . import helper and from .helper import x both point next to the file
+            base = node.module or ''
+            names.append(base)
+            names += [f'{base}.{alias.name}' if base else alias.name for alias in node.names]
+    found = []
+    for name in filter(None, names):
+        for candidate in _module_paths(name, os.path.dirname(path)):
+            if os.path.isfile(candidate):
+                found.append(os.path.normpath(candidate))
+                break
+    return found
+
+
+def source_files(year, day, solution_file='solution'):
+    # the solution and everything it imports locally, following imports of imports
+    files = [os.path.normpath(f'{year}/{day}/{solution_file}.py')]
+    for path in files:
+        for imported in local_imports(path):
+            if imported not in files:
+                files.append(imported)
+    return files
+
+
+def file_digest(path):
+    # hashlib.file_digest is only on 3.11+. read in chunks, so a large input is never
+    # held in memory at once
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def answer_key(year, day, solution_file, input_path):
+    digest = hashlib.sha256(f'{sys.version_info[:2]}\0'.encode())
+    for path in source_files(year, day, solution_file):
+        with open(path, 'rb') as f:
+            digest.update(f'\0{path}\0'.encode() + f.read())
+    digest.update(file_digest(input_path))
+    return digest.hexdigest()
+
+
+def lookup(key, part=0):
+    # (part1, part2, part1_ms, part2_ms, stored_at), or None unless every part asked for
+    # was computed before. answers come back as the strings they are printed and sent as
+    with results.connect() as db:
+        rows = {row[0]: row[1:] for row in db.execute(
+            'SELECT part, answer, time_ms, stored_at FROM runs WHERE solution_hash = ?', (key,)
+        )}
+    parts = (1, 2) if part == 0 else (part,)
+    if any(p not in rows for p in parts):
+        return None
+    (part1, part1_ms, _), (part2, part2_ms, _) = [rows.get(p, (None, 0, 0)) for p in (1, 2)]
+    return part1, part2, part1_ms, part2_ms, max(row[2] for row in rows.values())
+
+
+def store(key, part1, part2, part1_ms, part2_ms, part=0):
+    # parts that weren't asked for keep whatever an earlier run stored for them
+    with results.connect() as db:
+        db.executemany('INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?)', [
+            (key, p, None if answer is None else str(answer), ms, time.time())
+            for p, answer, ms in ((1, part1, part1_ms), (2, part2, part2_ms))
+            if part in (0, p)
+        ])
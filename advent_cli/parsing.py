@@ -0,0 +1,25 @@
+from . import config
+from .lazy import lazy_import
+
+bs4 = lazy_import('bs4')
+
+
+# the parts of each page that are read, the parser doesn't build a tree for the rest
+DAY_PAGE = ('article', 'p')
+STATS_PAGE = ('article',)
+# privboard-row and the div.user holding your name, strainers can't match name or class
+LEADERBOARD_PAGE = ('article', 'div')
+
+
+def parser_name():
+    # lxml builds the tree in C and is several times faster. bs4 only registers it when
+    # it is installed, otherwise the parser that ships with python is used
+    name = config.get_config().html_parser
+    if name is None:
+        name = 'lxml' if bs4.builder.builder_registry.lookup('lxml') else 'html.parser'
+    return name
+
+
+def parse(html, only=None):
+    strainer = bs4.SoupStrainer(list(only)) if only else None
+    return bs4.BeautifulSoup(html, parser_name(), parse_only=strainer)
@@ -0,0 +1,93 @@
+import sys
+import time
+
+from collections import namedtuple
+from contextlib import contextmanager
+
+from .lazy import lazy_import
+
+cProfile = lazy_import('cProfile')
+tracemalloc = lazy_import('tracemalloc')
+profiling = lazy_import('advent_cli.profiling')
+
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+
+Phase = namedtuple('Phase', ['name', 'wall_ns', 'cpu_ns', 'peak_bytes', 'net_bytes',
+                             'max_rss_bytes'], defaults=(None, None, None))
+
+
+def max_rss_bytes():
+    if resource is None:  # pragma: no cover
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # linux reports kilobytes, macOS reports bytes
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+def format_bytes(size):
+    for unit, scale in (('GiB', 1024**3), ('MiB', 1024**2), ('KiB', 1024)):
+        if abs(size) >= scale:
+            return f'{size / scale:.3g}{unit}'
+    return f'{size}B'
+
+
+class PhaseRecorder:
+    # collects wall clock and cpu time for each named step of a solution run, optionally
+    # with memory usage, a cProfile profile and/or sampled stacks for each step
+
+    def __init__(self, profile=False, sample_stacks=False, memory=False):
+        self.phases = []
+        self.profile = profile
+        self.sample_stacks = sample_stacks
+        self.memory = memory
+        self.profiles = {}
+        self.samplers = {}
+
+    @contextmanager
+    def phase(self, name):
+        profiler = cProfile.Profile() if self.profile else None
+        # the frame running the body of the with block, two up from this generator
+        sampler = profiling.StackSampler(sys._getframe(2)) if self.sample_stacks else None
+        if sampler is not None:
+            sampler.start()
+        if self.memory:
+            tracemalloc.start()
+        wall_start = time.perf_counter_ns()
+        cpu_start = time.process_time_ns()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            wall_ns = time.perf_counter_ns() - wall_start
+            cpu_ns = time.process_time_ns() - cpu_start
+            if self.memory:
+                # only allocations made during this phase are traced
+                net_bytes, peak_bytes = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                self.phases.append(Phase(name, wall_ns, cpu_ns, peak_bytes, net_bytes,
+                                         max_rss_bytes()))
+            else:
+                self.phases.append(Phase(name, wall_ns, cpu_ns))
+            if sampler is not None:
+                sampler.stop()
+                self.samplers[name] = sampler
+            if profiler is not None:
+                self.profiles[name] = profiler
+
+    def get(self, name):
+        for phase in reversed(self.phases):
+            if phase.name == name:
+                return phase
+        return None
+
+    def elapsed_ms(self, name):
+        phase = self.get(name)
+        return phase.wall_ns // 10**6 if phase is not None else 0
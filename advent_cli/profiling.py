@@ -0,0 +1,72 @@
+import io
+import os
+import pstats
+import sys
+import threading
+
+from collections import Counter
+
+
+def frame_label(code):
+    return f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})'
+
+
+def frame_depth(frame):
+    depth = 0
+    while frame is not None:
+        depth += 1
+        frame = frame.f_back
+    return depth
+
+
+class StackSampler:
+    # samples the call stack of one thread from a background thread. this runs alongside
+    # cProfile (which owns the profiling hook) and produces the collapsed stack format
+    # ("outer;inner;leaf count") read by flamegraph.pl and speedscope
+
+    def __init__(self, base_frame, interval=0.001):
+        self.interval = interval
+        self.thread_id = threading.get_ident()
+        # frames at or above the caller belong to advent-cli itself, not the solution
+        self.base_depth = frame_depth(base_frame)
+        self.counts = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        # the sampler needs the GIL to take a sample, so hand it over at least that often
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, self.interval))
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        sys.setswitchinterval(self._switch_interval)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(frame_label(frame.f_code))
+                frame = frame.f_back
+            stack = stack[::-1][self.base_depth:]
+            # don't count the sampler shutting itself down
+            if stack and not self._stop.is_set():
+                self.counts[tuple(stack)] += 1
+
+    def write_collapsed(self, path):
+        with open(path, 'w') as f:
+            for stack, count in sorted(self.counts.items()):
+                f.write(f'{";".join(stack)} {count}\n')
+
+
+def format_top(profile, top):
+    stream = io.StringIO()
+    stats = pstats.Stats(profile, stream=stream)
+    stats.strip_dirs().sort_stats('tottime').print_stats(top)
+    # drop the preamble pstats prints before the table
+    lines = stream.getvalue().strip('\n').split('\n')
+    start = next((i for i, line in enumerate(lines) if 'ncalls' in line), 0)
+    return '\n'.join(lines[start:])
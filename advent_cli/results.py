@@ -0,0 +1,192 @@
+import glob
+import os
+import re
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime as dt
+
+from . import config
+
+
+SCHEMA = '''
+CREATE TABLE results (
+    year TEXT NOT NULL,
+    day TEXT NOT NULL,
+    part INTEGER NOT NULL,
+    answer TEXT NOT NULL,
+    verdict TEXT NOT NULL,
+    time_ms INTEGER,
+    solution_hash TEXT,
+    recorded_at TEXT NOT NULL
+);
+CREATE INDEX results_by_day ON results (year, day, part, verdict);
+CREATE TABLE runs (
+    solution_hash TEXT NOT NULL,
+    part INTEGER NOT NULL,
+    answer TEXT,
+    time_ms INTEGER,
+    stored_at REAL NOT NULL,
+    PRIMARY KEY (solution_hash, part)
+);
+'''
+
+# run in order on databases whose user_version is lower than their position + 1
+MIGRATIONS = [
+    SCHEMA,
+    # 'high' or 'low' when adventofcode.com said which side of the answer a rejection was
+    'ALTER TABLE results ADD COLUMN bound TEXT;',
+]
+
+# answers read from the puzzle page after solving it, then ones adventofcode.com accepted
+# or rejected when they were submitted
+PROMPT = 'prompt'
+CORRECT = 'correct'
+INCORRECT = 'incorrect'
+
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def now():
+    return dt.now().strftime(DATE_FORMAT)
+
+
+@contextmanager
+def connect():
+    # one short lived connection per use, so forked workers and the daemon never share one
+    db = sqlite3.connect(config.get_config().results_db, timeout=10)
+    try:
+        version = db.execute('PRAGMA user_version').fetchone()[0]
+        if version < len(MIGRATIONS):
+            with db:
+                for migration in MIGRATIONS[version:]:
+                    db.executescript(migration)
+                if version == 0:
+                    import_text_files(db)
+                db.execute(f'PRAGMA user_version = {len(MIGRATIONS)}')
+        with db:
+            yield db
+    finally:
+        db.close()
+
+
+def record(year, day, part, answer, verdict, time_ms=None, solution_hash=None,
+           recorded_at=None, bound=None):
+    with connect() as db:
+        db.execute('INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                   (year, day, part, str(answer), verdict, time_ms, solution_hash,
+                    recorded_at or now(), bound))
+
+
+def expected_answers(year, day):
+    return expected_answers_for_year(year, day).get(day, (None, None))
+
+
+def expected_answers_for_year(year, day=None):
+    # {day: (part1, part2)}. the puzzle page wins over submissions, later beats earlier
+    query = ('SELECT day, part, answer FROM results WHERE year = ? AND verdict IN (?, ?)'
+             + (' AND day = ?' if day else '')
+             + ' ORDER BY day, part, verdict = ?, recorded_at, rowid')
+    params = (year, PROMPT, CORRECT) + ((day,) if day else ()) + (PROMPT,)
+    expected = {}
+    with connect() as db:
+        for row_day, part, answer in db.execute(query, params):
+            answers = expected.setdefault(row_day, [None, None])
+            answers[part - 1] = answer
+    return {row_day: tuple(answers) for row_day, answers in expected.items()}
+
+
+def _number(answer):
+    try:
+        return int(answer)
+    except ValueError:
+        return None
+
+
+def known_wrong(year, day, part, answer):
+    # why answer can't be right without asking adventofcode.com, or None
+    answer = str(answer)
+    with connect() as db:
+        rejected = db.execute('SELECT answer, bound, recorded_at FROM results WHERE year = ? '
+                              'AND day = ? AND part = ? AND verdict = ?',
+                              (year, day, part, INCORRECT)).fetchall()
+    for rejected_answer, _, recorded_at in rejected:
+        if rejected_answer == answer:
+            return f'{answer} was already rejected on {recorded_at}'
+    number = _number(answer)
+    if number is None:
+        return None
+    too_low = [n for n in (_number(a) for a, bound, _ in rejected if bound == 'low')
+               if n is not None]
+    too_high = [n for n in (_number(a) for a, bound, _ in rejected if bound == 'high')
+                if n is not None]
+    if too_low and number <= max(too_low):
+        return f'{answer} is not above {max(too_low)}, which was too low'
+    if too_high and number >= min(too_high):
+        return f'{answer} is not below {min(too_high)}, which was too high'
+    return None
+
+
+def prompt_parts(year, day):
+    # the parts whose answer has been read from the puzzle page
+    with connect() as db:
+        return {part for part, in db.execute(
+            'SELECT DISTINCT part FROM results WHERE year = ? AND day = ? AND verdict = ?',
+            (year, day, PROMPT))}
+
+
+result_header_re = re.compile(r'Puzzle \d+/\d+ Part \d : (?:Failed )?Result for (.+)')
+answer_line_re = re.compile(r'Part(\d) (?:Incorrect )?Answer: (.*)')
+time_line_re = re.compile(r'Execution Time: ([\d.]+)ms')
+prompt_header_re = re.compile(r'Puzzle \d+/\d+ : Correct Answers retrieved from prompt '
+                              r'on (.+)')
+prompt_answer_re = re.compile(r'Part(\d): .*?<code>(.*?)</code>')
+
+
+def parse_result_log(text, year, day, verdict):
+    # the blocks record_result used to append to correct_results.txt/incorrect_results.txt,
+    # like the old reader only the answer lines are required
+    rows = []
+    date = None
+    for line in text.splitlines():
+        if result_header_re.match(line):
+            date = result_header_re.match(line).group(1).strip()
+        elif answer_line_re.match(line):
+            part, answer = answer_line_re.match(line).groups()
+            rows.append([year, day, int(part), answer.strip(), verdict, None, None,
+                         date or now(), None])
+            date = None
+        elif rows and time_line_re.match(line):
+            rows[-1][5] = round(float(time_line_re.match(line).group(1)))
+    return [tuple(row) for row in rows]
+
+
+def parse_prompt_results(text, year, day):
+    rows = []
+    date = None
+    for line in text.splitlines():
+        if prompt_header_re.match(line):
+            date = prompt_header_re.match(line).group(1).strip()
+        elif prompt_answer_re.match(line):
+            part, answer = prompt_answer_re.match(line).groups()
+            rows.append((year, day, int(part), answer, PROMPT, None, None, date or now(),
+                         None))
+    return rows
+
+
+def import_text_files(db, path='.'):
+    # run once when the database is created, the text files are left where they are
+    count = 0
+    for filename in sorted(glob.glob(os.path.join(path, '[0-9]*', '[0-9]*', '*_results.txt'))):
+        with open(filename, 'r') as f:
+            text = f.read()
+        year, day, name = filename.split(os.sep)[-3:]
+        if name == 'prompt_results.txt':
+            rows = parse_prompt_results(text, year, day)
+        elif name in ('correct_results.txt', 'incorrect_results.txt'):
+            rows = parse_result_log(text, year, day,
+                                    CORRECT if name.startswith('correct') else INCORRECT)
+        else:
+            continue
+        db.executemany('INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', rows)
+        count += len(rows)
+    return count
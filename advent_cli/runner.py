@@ -0,0 +1,205 @@
+import contextlib
+import io
+import math
+import multiprocessing
+import os
+import signal
+import sys
+import time
+import traceback
+
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from .phases import PhaseRecorder, format_bytes
+from .utils import build_puzzle, colored, compute_answers, input_file, load_solution, RunStatus
+
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+
+DayResult = namedtuple('DayResult', ['day', 'part1', 'part2', 'part1_ms', 'part2_ms',
+                                     'wall_ns', 'error'])
+
+
+def solved_days(year, solution_file='solution'):
+    return [f'{d:02}' for d in range(1, 26)
+            if os.path.exists(f'{year}/{d:02}/{solution_file}.py')
+            and os.path.exists(f'{year}/{d:02}/input.txt')]
+
+
+def run_day(year, day, solution_file='solution'):
+    # runs in a pool worker, so it must stay a picklable module level function. output
+    # from the solution is swallowed, only the summary table is printed
+    start = time.perf_counter_ns()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            input = input_file(year, day)
+            part1, part2, part1_ms, part2_ms = compute_answers(year, day, input,
+                                                               solution_file=solution_file)
+        error = None
+    except Exception:
+        part1 = part2 = None
+        part1_ms = part2_ms = 0
+        error = traceback.format_exc(limit=-1).strip().split('\n')[-1]
+    return DayResult(day, part1, part2, part1_ms, part2_ms,
+                     time.perf_counter_ns() - start, error)
+
+
+ExampleResult = namedtuple('ExampleResult', ['filename', 'part', 'answer', 'time', 'expected',
+                                             'output', 'error'])
+
+
+def example_cases(year, day, part=0):
+    cases = []
+    for filename in sorted(os.listdir(f'{year}/{day}/')):
+        if filename.startswith('test_part1_') and part != 2:
+            cases.append((filename, 1))
+        elif filename.startswith('test_part2_') and part != 1:
+            cases.append((filename, 2))
+    return cases
+
+
+def run_example(year, day, filename, part, solution_file='solution'):
+    # example files hold a header line, the expected answer, a separator and the input
+    with open(f'{year}/{day}/{filename}', 'r') as f:
+        lines = f.readlines()
+    expected = lines[1].strip()
+    input = [line.replace('\r', '').replace('\n', '') for line in lines[3:]]
+
+    # anything the solution prints is handed back so it can be shown next to its case
+    output = io.StringIO()
+    answer, elapsed, error = None, 0, None
+    try:
+        with contextlib.redirect_stdout(output):
+            part1, part2, part1_ms, part2_ms = compute_answers(year, day, input,
+                                                               solution_file=solution_file,
+                                                               example=True, part=part)
+        answer, elapsed = (part1, part1_ms) if part == 1 else (part2, part2_ms)
+    except Exception:
+        error = traceback.format_exc(limit=-1).strip().split('\n')[-1]
+    return ExampleResult(filename, part, answer, elapsed, expected, output.getvalue(), error)
+
+
+def example_failed(result):
+    return result.error is not None or result.expected != str(result.answer)
+
+
+def run_part(year, day, input, part, solution_file='solution', memory=False):
+    # each worker builds its own Puzzle, so the timing covers exactly one part
+    recorder = PhaseRecorder(memory=memory)
+    solution = load_solution(year, day, solution_file)
+    # and opens its own copy of the input, so streamed inputs aren't shared between parts
+    puzzle = build_puzzle(year, day, solution, input, solution_file=solution_file,
+                          recorder=recorder)
+    # part 2 depends on state left behind by part 1, which may be set on the instance
+    if part == 2 and puzzle.always_run_part_1:
+        with recorder.phase('part1'):
+            puzzle.part1()
+    with recorder.phase(f'part{part}'):
+        answer = puzzle.part1() if part == 1 else puzzle.part2()
+    return answer, recorder.phases
+
+
+def compute_answers_parallel(year, day, input, solution_file='solution', recorder=None):
+    if recorder is None:
+        recorder = PhaseRecorder()
+
+    with recorder.phase('import'):
+        load_solution(year, day, solution_file)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(run_part, year, day, input, part, solution_file,
+                                   recorder.memory)
+                   for part in (1, 2)]
+        (part1_answer, part1_phases), (part2_answer, part2_phases) = \
+            [future.result() for future in futures]
+    # both workers construct the puzzle at the same time, only one of them is reported
+    recorder.phases += part1_phases + [p for p in part2_phases if p.name == 'part2']
+
+    return (part1_answer, part2_answer,
+            recorder.elapsed_ms('part1'), recorder.elapsed_ms('part2'))
+
+
+SandboxResult = namedtuple('SandboxResult', ['status', 'message', 'part1', 'part2',
+                                             'part1_ms', 'part2_ms'])
+
+
+def _sandbox_child(conn, year, day, input, solution_file, example, part, memory,
+                   memory_limit, cpu_limit):
+    if resource is not None:
+        if memory_limit:
+            resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+        if cpu_limit:
+            # SIGXCPU at the soft limit, SIGKILL a second later if that is ignored
+            resource.setrlimit(resource.RLIMIT_CPU, (cpu_limit, cpu_limit + 1))
+    recorder = PhaseRecorder(memory=memory)
+    try:
+        answers = compute_answers(year, day, input, solution_file=solution_file,
+                                  example=example, part=part, recorder=recorder)
+        conn.send((RunStatus.OK, None, answers, recorder.phases))
+    except MemoryError:
+        conn.send((RunStatus.OOM, None, None, recorder.phases))
+    except Exception:
+        traceback.print_exc()
+        conn.send((RunStatus.ERROR, traceback.format_exc(limit=-1).strip().split('\n')[-1],
+                   None, recorder.phases))
+    finally:
+        conn.close()
+
+
+def run_sandboxed(year, day, input, solution_file='solution', example=False, part=0,
+                  recorder=None, timeout=None, memory_limit=None):
+    # runs compute_answers in a child process, so a solution that never finishes or
+    # allocates without bound is stopped without taking the cli down with it
+    if recorder is None:
+        recorder = PhaseRecorder()
+    cpu_limit = math.ceil(timeout) if timeout else None
+    if resource is None and memory_limit:
+        print(colored('--memory-limit is not enforced on this platform, '
+                      'only the timeout applies.', 'yellow'))
+
+    sys.stdout.flush()
+    parent_conn, child_conn = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(
+        target=_sandbox_child,
+        args=(child_conn, year, day, input, solution_file, example, part, recorder.memory,
+              memory_limit, cpu_limit)
+    )
+    process.start()
+    child_conn.close()
+
+    result, timed_out = None, False
+    if parent_conn.poll(timeout):
+        try:
+            result = parent_conn.recv()
+        except EOFError:
+            pass
+    else:
+        timed_out = True
+    if process.is_alive():
+        process.kill()
+    process.join()
+    parent_conn.close()
+
+    if result is not None:
+        status, message, answers, phases = result
+        recorder.phases += phases
+        if status == RunStatus.OK:
+            return SandboxResult(status, None, *answers)
+    elif timed_out or process.exitcode == -getattr(signal, 'SIGXCPU', 0):
+        status, message = RunStatus.TIMEOUT, None
+    elif process.exitcode == -getattr(signal, 'SIGKILL', 0):
+        # not killed by us, so it was the kernel's oom killer
+        status, message = RunStatus.OOM, None
+    else:
+        status, message = RunStatus.ERROR, f'exited with code {process.exitcode}'
+
+    if status == RunStatus.TIMEOUT:
+        message = f'no answer within {timeout:g}s'
+    elif status == RunStatus.OOM:
+        message = (f'exceeded the {format_bytes(memory_limit)} memory limit' if memory_limit
+                   else 'ran out of memory')
+    return SandboxResult(status, message, None, None, 0, 0)
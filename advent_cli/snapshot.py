@@ -0,0 +1,102 @@
+import ast
+import hashlib
+import os
+import pickle
+import sys
+
+from . import config, memo
+
+
+# Puzzle methods that don't affect the constructed state, editing them keeps the snapshot
+PART_METHODS = ('part1', 'part2')
+
+
+def enabled(puzzle):
+    # opt in per solution, building the key hashes the whole input on every run
+    return getattr(puzzle, 'cache_parsed', False) is True
+
+
+def parse_code(path):
+    # the solution without the bodies of part1 and part2, as an ast dump so comments and
+    # formatting don't count either. any other change may change what __init__ builds
+    with open(path, 'rb') as f:
+        tree = ast.parse(f.read())
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ClassDef) and node.name == 'Puzzle':
+            node.body = [item for item in node.body
+                         if not (isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef))
+                                 and item.name in PART_METHODS)]
+    return ast.dump(tree)
+
+
+def snapshot_key(year, day, solution_file, input_path, mode):
+    digest = hashlib.sha256(f'{sys.version_info[:2]}\0{mode}\0'.encode())
+    digest.update(parse_code(f'{year}/{day}/{solution_file}.py').encode())
+    # anything the solution imports locally can be part of parsing
+    for path in memo.source_files(year, day, solution_file)[1:]:
+        with open(path, 'rb') as f:
+            digest.update(f'\0{path}\0'.encode() + f.read())
+    digest.update(memo.file_digest(input_path))
+    return digest.hexdigest()
+
+
+def snapshot_dir():
+    return os.path.join(config.get_config().cache_dir, 'puzzles')
+
+
+def _path(key):
+    return os.path.join(snapshot_dir(), f'{key}.pickle')
+
+
+def load(key):
+    try:
+        with open(_path(key), 'rb') as f:
+            puzzle = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # written by an older solution whose classes have since changed
+        remove(key)
+        return None
+    # the mtime doubles as the last access time for LRU eviction
+    os.utime(_path(key))
+    return puzzle
+
+
+def store(key, puzzle):
+    # pickle honours __getstate__/__setstate__, so a solution can choose what is saved
+    data = pickle.dumps(puzzle, protocol=pickle.HIGHEST_PROTOCOL)
+    os.makedirs(snapshot_dir(), exist_ok=True)
+    tmp_path = f'{_path(key)}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, _path(key))
+    evict(config.get_config().snapshot_cache_size)
+
+
+def remove(key):
+    try:
+        os.remove(_path(key))
+    except OSError:
+        pass
+
+
+def evict(max_bytes):
+    try:
+        names = [name for name in os.listdir(snapshot_dir()) if name.endswith('.pickle')]
+    except FileNotFoundError:
+        return
+    entries = []
+    for name in names:
+        try:
+            stat = os.stat(os.path.join(snapshot_dir(), name))
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, name[:-len('.pickle')]))
+    entries.sort()
+    total = sum(size for _, size, _ in entries)
+    for _, size, key in entries:
+        if total <= max_bytes:
+            break
+        remove(key)
+        total -= size
@@ -1,10 +1,7 @@
 import argparse
-import markdownify
 import os
 import re as re
-import requests
 import sys
-import pytz
 
 from datetime import datetime as dt
 from enum import Enum
@@ -13,10 +10,19 @@ from importlib import import_module
 from math import ceil
 from itertools import tee
 from copy import copy
+from collections import namedtuple
 from collections.abc import Generator
 from termcolor import colored as tc_colored
 import time
-from . import config
+from . import config, inputs
+from .lazy import lazy_import
+
+pytz = lazy_import('pytz')
+client = lazy_import('advent_cli.client')
+markdown = lazy_import('advent_cli.markdown')
+parsing = lazy_import('advent_cli.parsing')
+phases = lazy_import('advent_cli.phases')
+snapshot = lazy_import('advent_cli.snapshot')
 
 
 class Status(Enum):
@@ -28,8 +34,15 @@ class Status(Enum):
     UNKNOWN = 5
 
 
+class RunStatus(Enum):
+    OK = 0
+    TIMEOUT = 1
+    OOM = 2
+    ERROR = 3
+
+
 def colored(text, color):
-    if config.get_config()['disable_color']:
+    if config.get_config().disable_color:
         if text == '*':
             if color == 'cyan':
                 return '/'
@@ -40,52 +53,93 @@ def colored(text, color):
         return tc_colored(text, color)
 
 
-def compute_answers(year, day, input, solution_file='solution', example=False, part = 0):
-    sys.path.append(os.getcwd())
-    solution = import_module(f'{year}.{day}.{solution_file}')
-               
-    puzzle = solution.Puzzle(input, example)
-
-    #if isinstance(data, Generator):
-    #    data1, data2 = tee(data)
-    #else:
-    #    data1, data2 = copy(data), copy(data)
-    #if not isinstance(data, tuple):
-    #    data1 = (data1,)
-    #    data2 = (data2,)
-    if part == 2 and not puzzle.always_run_part_1:
-        part1_answer = None
-        part1_time = 0
-    else:
-        start = time.time()
-        part1_answer = puzzle.part1()
-        end = time.time()
-        part1_time = (end-start) * 10**3
-    if part == 1: 
-        part2_answer = None
-        part2_time = 0
-    else:
-        start = time.time()
-        part2_answer = puzzle.part2()
-        end = time.time()
-        part2_time = (end-start) * 10**3
-    return part1_answer, part2_answer, int(part1_time), int(part2_time)
+def load_solution(year, day, solution_file='solution'):
+    if os.getcwd() not in sys.path:
+        sys.path.append(os.getcwd())
+    return import_module(f'{year}.{day}.{solution_file}')
+
+
+def read_input(year, day):
+    return inputs.read_lines(f'{year}/{day}/input.txt')
+
+
+def input_file(year, day):
+    return inputs.InputFile(f'{year}/{day}/input.txt')
+
+
+def build_puzzle(year, day, solution, input, solution_file='solution', example=False,
+                 recorder=None):
+    if recorder is None:
+        recorder = phases.PhaseRecorder()
+
+    # solutions with cache_parsed restore the Puzzle as it was right after __init__
+    key = None
+    if isinstance(input, inputs.InputFile) and snapshot.enabled(solution.Puzzle):
+        with recorder.phase('restore'):
+            key = snapshot.snapshot_key(year, day, solution_file, input.path,
+                                        inputs.input_mode(solution.Puzzle))
+            puzzle = snapshot.load(key)
+        if puzzle is not None:
+            return puzzle
+
+    with recorder.phase('read_input'):
+        input = inputs.for_puzzle(input, solution.Puzzle)
+
+    with recorder.phase('construct'):
+        puzzle = solution.Puzzle(input, example)
+
+    if key is not None:
+        try:
+            with recorder.phase('snapshot'):
+                snapshot.store(key, puzzle)
+        except Exception as e:
+            print(colored(f'Could not snapshot Puzzle ({type(e).__name__}: {e})', 'grey'))
+    return puzzle
+
+
+def compute_answers(year, day, input, solution_file='solution', example=False, part = 0,
+                    recorder=None):
+    if recorder is None:
+        recorder = phases.PhaseRecorder()
+
+    with recorder.phase('import'):
+        solution = load_solution(year, day, solution_file)
+
+    puzzle = build_puzzle(year, day, solution, input, solution_file=solution_file,
+                          example=example, recorder=recorder)
+
+    part1_answer, part1_time = None, 0
+    if part != 2 or puzzle.always_run_part_1:
+        with recorder.phase('part1'):
+            part1_answer = puzzle.part1()
+        part1_time = recorder.elapsed_ms('part1')
+
+    part2_answer, part2_time = None, 0
+    if part != 1:
+        with recorder.phase('part2'):
+            part2_answer = puzzle.part2()
+        part2_time = recorder.elapsed_ms('part2')
+
+    return part1_answer, part2_answer, part1_time, part2_time
+
+
+wait_re = re.compile(r'You have (?:(\d+)m )?(\d+)s left to wait')
 
 
 def submit_answer(year, day, level, answer):
     payload = {'level': level, 'answer': answer}
-    r = requests.post(
-        f'https://adventofcode.com/{year}/day/{int(day)}/answer',
-        data=payload,
-        cookies={'session': config.get_config()['session_cookie']}
-    )
+    r = client.post(f'https://adventofcode.com/{year}/day/{int(day)}/answer', data=payload)
     response = r.text
     if "That's the right answer" in response:
         return Status.PASS, None
     elif "That's not the right answer" in response:
-        return Status.FAIL, None
+        # 'high' or 'low' when the response says which way the answer is off
+        bound = re.search(r'your answer is too (high|low)', response)
+        return Status.FAIL, bound and bound.group(1)
     elif 'You gave an answer too recently' in response:
-        return Status.RATE_LIMIT, None
+        # seconds left on the lockout, when the response says
+        wait = wait_re.search(response)
+        return Status.RATE_LIMIT, wait and int(wait.group(1) or 0) * 60 + int(wait.group(2))
     elif 'Did you already complete it?' in response:
         return Status.COMPLETED, None
     elif '[Log In]' in response:
@@ -94,6 +148,15 @@ def submit_answer(year, day, level, answer):
         return Status.UNKNOWN, response
 
 
+def unlocked_days(year):
+    today = dt.now(pytz.timezone('America/New_York'))
+    if today.year > int(year):
+        return 25
+    elif today.year == int(year) and today.month == 12:
+        return min(today.day, 25)
+    return 0
+
+
 def get_time_until_unlock(year, day):
     est = pytz.timezone('EST')
     unlock_time = est.localize(dt(int(year), 12, int(day)))
@@ -133,32 +196,35 @@ class CustomHelpFormatter(argparse.RawTextHelpFormatter):
                              super()._format_action(action)))
 
 
-class CustomMarkdownConverter(markdownify.MarkdownConverter):
+def custom_markdownify(html, **options):
+    return markdown.CustomMarkdownConverter(config.get_config().md_em,
+                                            **options).convert(html)
 
-    def __init__(self, md_em, **options):
-        self.md_em = md_em
-        super().__init__(**options)
 
-    def convert_em(self, el, text, convert_as_inline):
-        if el.parent.name == 'code':
-            if self.md_em == 'ib':
-                return f'<i><b>{text}</b></i>'
-            elif self.md_em == 'mark':
-                return f'<mark>{text}</mark>'
-            elif self.md_em == 'none' or self.md_em == '':
-                return text
-        return super().convert_em(el, text, convert_as_inline)
+# a puzzle page: the html of each part of the prompt that is unlocked and the answers
+# shown under the parts already solved
+DayPage = namedtuple('DayPage', ['parts', 'answers'])
 
-    def convert_code(self, el, text, convert_as_inline):
-        if self.md_em in ['ib', 'mark']:
-            return f'<code>{text}</code>'
-        return super().convert_code(el, text, convert_as_inline)
+answer_text_re = re.compile('Your puzzle answer was')
 
-    def convert_pre(self, el, text, convert_as_inline):
-        if self.md_em in ['ib', 'mark']:
-            return f'\n<pre>{text}</pre>\n'
-        return super().convert_pre(el, text, convert_as_inline)
 
+def parse_day_page(html):
+    # everything get and submit need from the page, so it is only ever parsed once
+    soup = parsing.parse(html, parsing.DAY_PAGE)
+    parts = [article.decode_contents()
+             for article in soup.find_all('article', class_='day-desc')]
+    # the text next to each answer, rather than rendering every paragraph to look for it
+    answers = [text.find_next_sibling('code').decode_contents()
+               for text in soup.find_all(string=answer_text_re)]
+    return DayPage(parts, answers)
 
-def custom_markdownify(html, **options):
-    return CustomMarkdownConverter(config.get_config()['md_em'], **options).convert(html)
+
+def part_markdown(part_html):
+    # remove hyphens from title sections, makes markdown look nicer
+    part_html = re.sub('--- (.*) ---', r'\1', part_html)
+
+    return custom_markdownify(part_html)
+
+
+def prompt_markdown(html, part=1):
+    return part_markdown(parse_day_page(html).parts[part - 1])
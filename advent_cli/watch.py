@@ -0,0 +1,75 @@
+import importlib
+import importlib.util
+import os
+import sys
+import time
+
+
+def watched_files(year, day, example=False):
+    # solution files (and any helpers next to them) always count, inputs only count
+    # for the kind of run being watched
+    path = f'{year}/{day}/'
+    for name in sorted(os.listdir(path)):
+        if name.endswith('.py') or name == ('example_input.txt' if example else 'input.txt') \
+                or (example and name.startswith(('test_part1_', 'test_part2_'))):
+            yield os.path.join(path, name)
+
+
+def snapshot(year, day, example=False):
+    files = {}
+    for path in watched_files(year, day, example):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        files[path] = (stat.st_mtime_ns, stat.st_size)
+    return files
+
+
+def changed_files(before, after):
+    return sorted(path for path in before.keys() | after.keys()
+                  if before.get(path) != after.get(path))
+
+
+def wait_for_changes(year, day, example=False, interval=0.5):
+    before = snapshot(year, day, example)
+    while True:
+        time.sleep(interval)
+        after = snapshot(year, day, example)
+        changed = changed_files(before, after)
+        if changed:
+            # editors often save in more than one write, give them a moment to finish
+            time.sleep(interval / 5)
+            return changed_files(before, snapshot(year, day, example))
+
+
+def module_name(year, day, path):
+    return f'{year}.{day}.{os.path.splitext(os.path.basename(path))[0]}'
+
+
+def reload_modules(year, day, paths):
+    importlib.invalidate_caches()
+    reloaded = []
+    for path in paths:
+        name = module_name(year, day, path)
+        if not path.endswith('.py') or name not in sys.modules:
+            continue
+        # the .pyc check only looks at whole second mtimes and the size, which misses
+        # quick edits that keep the length the same
+        cached = importlib.util.cache_from_source(path)
+        if os.path.exists(cached):
+            os.remove(cached)
+        if os.path.exists(path):
+            importlib.reload(sys.modules[name])
+        else:
+            del sys.modules[name]
+        reloaded.append(name)
+
+    # solutions importing a changed helper still hold the old objects until they reload too
+    prefix = f'{year}.{day}.solution'
+    if any(not name.startswith(prefix) for name in reloaded):
+        for name in sorted(sys.modules):
+            if name.startswith(prefix) and name not in reloaded:
+                importlib.reload(sys.modules[name])
+                reloaded.append(name)
+    return reloaded
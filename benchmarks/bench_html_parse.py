@@ -0,0 +1,135 @@
+# times scraping the day, personal stats and private leaderboard pages with each parser
+# backend, parsing the whole page as before against only the parts that are read.
+# the pages are stand-ins with the same layout as adventofcode.com: header, sidebar and
+# scripts around the main content
+#
+#   python -m benchmarks.bench_html_parse [--members 200] [--repeat 20]
+
+import argparse
+import os
+import random
+import timeit
+
+import bs4
+
+os.environ.setdefault('ADVENT_SESSION_COOKIE', 'benchmark')
+
+from advent_cli import config, leaderboard, parsing, utils  # noqa: E402
+from benchmarks.bench_leaderboard_parse import make_members, make_html  # noqa: E402
+
+
+PAGE_HEAD = (
+    '<!DOCTYPE html>\n<html lang="en-us">\n<head>\n<meta charset="utf-8"/>\n'
+    '<title>Advent of Code 2021</title>\n'
+    '<link rel="stylesheet" type="text/css" href="/static/style.css?30"/>\n'
+    '<script>window.addEventListener("click", function(e, s, r) {'
+    ' if (e.target.nodeName === "CODE" && e.detail === 3) {'
+    ' s = window.getSelection(); s.removeAllRanges(); r = document.createRange();'
+    ' r.selectNodeContents(e.target); s.addRange(r); } });</script>\n</head>\n<body>\n'
+    '<header><div><h1 class="title-global"><a href="/">Advent of Code</a></h1><nav><ul>'
+    + ''.join(f'<li><a href="/2021/{item.lower()}">[{item}]</a></li>'
+              for item in ('About', 'Events', 'Shop', 'Settings', 'Log Out'))
+    + '</ul></nav><div class="user">member0 <span class="star-count">50*</span></div></div>'
+    '</header>\n<div id="sidebar"><div id="sponsor"><div class="quiet">Our '
+    '<a href="/2021/sponsors">sponsors</a> help make Advent of Code possible:</div>'
+    '<div class="sponsor"><a href="https://example.com">Example</a> - building tools for '
+    'people who build things</div></div></div>\n<main>\n'
+)
+PAGE_TAIL = (
+    '</main>\n<script>(function(i, s, o, g, r, a, m) { i["GoogleAnalyticsObject"] = r;'
+    ' })(window, document, "script", "//www.google-analytics.com/analytics.js", "ga");'
+    '</script>\n</body>\n</html>\n'
+)
+
+
+def make_day_page(paragraphs=12, seed=2021):
+    rng = random.Random(seed)
+    words = ['elves', 'sleigh', '<em>reindeer</em>', 'the', 'of', '<code>42</code>',
+             'submarine', 'a', 'and', '<a href="/2021/day/1">sonar</a>', 'depth', 'map']
+
+    def part(title):
+        body = ''.join(f'<p>{" ".join(rng.choice(words) for _ in range(60))}.</p>\n'
+                       for _ in range(paragraphs))
+        example = '\n'.join(str(rng.randrange(1000)) for _ in range(10))
+        return (f'<article class="day-desc"><h2>--- {title} ---</h2>{body}'
+                f'<pre><code>{example}\n</code></pre></article>\n')
+
+    return (PAGE_HEAD + part('Day 1: Sonar Sweep')
+            + '<p>Your puzzle answer was <code>1400</code>.</p>' + part('Part Two')
+            + '<p>Your puzzle answer was <code>1429</code>.</p>'
+            + '<p class="day-success">Both parts of this puzzle are complete!</p>\n'
+            + '<p>At this point, you should <a href="/2021">return to your Advent '
+            'calendar</a> and try another puzzle.</p>\n' + PAGE_TAIL)
+
+
+def make_stats_page(seed=2021):
+    rng = random.Random(seed)
+    rows = '\n'.join(
+        f'{day:>3}   {rng.randrange(24):02}:{rng.randrange(60):02}:{rng.randrange(60):02}'
+        f'  {rng.randrange(1, 99999):>5}      0   {rng.randrange(24):02}:'
+        f'{rng.randrange(60):02}:{rng.randrange(60):02}  {rng.randrange(1, 99999):>5}      0'
+        for day in range(25, 0, -1)
+    )
+    return (PAGE_HEAD + '<article><p>These are your personal leaderboard statistics.</p>'
+            '<pre>      <span class="leaderboard-daydesc-first">--------Part 1--------</span>'
+            '   <span class="leaderboard-daydesc-both">--------Part 2--------</span>\n'
+            'Day       Time   Rank  Score       Time   Rank  Score\n'
+            f'{rows}\n</pre></article>\n' + PAGE_TAIL)
+
+
+def make_board_page(members):
+    board = make_html(make_members(members))
+    # keep the leaderboard's own article, in the page layout everything else has
+    article = board[board.index('<article>'):board.index('</main>')]
+    return PAGE_HEAD + article + PAGE_TAIL
+
+
+def parse_stats(text):
+    return parsing.parse(text, parsing.STATS_PAGE).select('article pre')[0].text
+
+
+TARGETS = ('DAY_PAGE', 'STATS_PAGE', 'LEADERBOARD_PAGE')
+
+
+def configure(backend, targeted):
+    config.override(html_parser=backend)
+    # without a target the parser builds the whole page, as it did before
+    for name in TARGETS:
+        setattr(parsing, name, saved_targets[name] if targeted else None)
+
+
+saved_targets = {name: getattr(parsing, name) for name in TARGETS}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--members', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    pages = [
+        ('day', make_day_page(), utils.parse_day_page),
+        ('stats', make_stats_page(), parse_stats),
+        (f'board ({args.members})', make_board_page(args.members), leaderboard.parse_html),
+    ]
+    backends = ['html.parser']
+    if bs4.builder.builder_registry.lookup('lxml'):
+        backends.append('lxml')
+    else:
+        print('lxml is not installed, only timing html.parser')
+
+    print(f'best of {args.repeat}, speedup over the whole page with html.parser')
+    for name, text, scrape in pages:
+        print(f'  {name} ({len(text) // 1024}KB)')
+        baseline = None
+        for backend in backends:
+            for targeted in (False, True):
+                configure(backend, targeted)
+                best = min(timeit.repeat(lambda: scrape(text), number=1, repeat=args.repeat))
+                baseline = baseline or best
+                label = f'{backend}{", targeted" if targeted else ""}'
+                print(f'    {label:<22} {best * 1000:8.2f}ms  {baseline / best:5.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+# compares bare requests.get() calls against the pooled client session
+# using a local stand-in server; each new connection sleeps for --handshake-ms
+# to approximate the TCP+TLS setup cost of talking to adventofcode.com. the rate
+# limiter and response cache are turned off so only connection reuse is measured
+#
+#   python -m benchmarks.bench_http_session [-n 50] [--handshake-ms 30]
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+os.environ.setdefault('ADVENT_SESSION_COOKIE', 'benchmark')
+
+from advent_cli import client, config  # noqa: E402
+
+
+def make_handler(handshake_ms):
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+        body = b'<article class="day-desc"><p>stand-in</p></article>' * 20
+
+        def setup(self):
+            time.sleep(handshake_ms / 1000)
+            super().setup()
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html')
+            self.send_header('Content-Length', str(len(self.body)))
+            self.end_headers()
+            self.wfile.write(self.body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def run(fetch, url, n):
+    start = time.perf_counter()
+    for _ in range(n):
+        fetch(url).content
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', type=int, default=50, help='requests per run')
+    parser.add_argument('--handshake-ms', type=float, default=30)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(args.handshake_ms))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_port}/2099/day/1'
+
+    bare = run(lambda u: requests.get(u, cookies={'session': 'benchmark'}), url, args.n)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        config.override(max_requests_per_second=0, cache_enabled=False, cache_dir=cache_dir)
+        pooled = run(client.get, url, args.n)
+    server.shutdown()
+
+    print(f'{args.n} requests, {args.handshake_ms:g}ms simulated handshake')
+    print(f'  bare requests.get: {bare * 1000:8.1f}ms ({bare / args.n * 1000:.2f}ms/req)')
+    print(f'  pooled session:    {pooled * 1000:8.1f}ms ({pooled / args.n * 1000:.2f}ms/req)')
+    print(f'  speedup:           {bare / pooled:8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+# measures what starting the cli costs with python -X importtime, in a fresh interpreter
+# each run, and fails if the cli module goes over its budget
+#
+#   python -m benchmarks.bench_import_time [--repeat 5] [--budget 60] [--top 10]
+
+import argparse
+import os
+import subprocess
+import sys
+
+# modules a plain `advent day 03` or `advent --help` should never have to load
+HEAVY_MODULES = ('bs4', 'curses', 'markdownify', 'multiprocessing', 'pytz', 'requests',
+                 'tabulate')
+
+
+def import_times(module):
+    env = {**os.environ, 'ADVENT_SESSION_COOKIE': 'benchmark'}
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True, env=env, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--budget', type=float, default=60, help='milliseconds')
+    parser.add_argument('--top', type=int, default=10)
+    args = parser.parse_args()
+
+    runs = [import_times('advent_cli.cli') for _ in range(args.repeat)]
+    best = min(runs, key=lambda times: times['advent_cli.cli'][1])
+    total_ms = best['advent_cli.cli'][1] / 1000
+    # everything site and the interpreter load before us isn't ours to budget
+    ours = {name: times for name, times in best.items()
+            if name not in import_times('site')}
+
+    print(f'import advent_cli.cli (best of {args.repeat}): {total_ms:.1f}ms'
+          f' (budget {args.budget:g}ms)')
+    print('  slowest imports by own time:')
+    for name, (self_us, _) in sorted(ours.items(), key=lambda item: -item[1][0])[:args.top]:
+        print(f'    {self_us / 1000:7.2f}ms  {name}')
+    heavy = sorted(name for name in ours if name.split('.')[0] in HEAVY_MODULES)
+    if heavy:
+        print(f'  heavy modules imported at startup: {", ".join(heavy)}')
+
+    if total_ms > args.budget or heavy:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
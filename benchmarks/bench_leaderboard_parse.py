@@ -0,0 +1,75 @@
+# times parsing a synthetic private leaderboard with the json backend
+# against scraping the equivalent html page
+#
+#   python -m benchmarks.bench_leaderboard_parse [--members 200] [--repeat 5]
+
+import argparse
+import json
+import os
+import random
+import timeit
+
+os.environ.setdefault('ADVENT_SESSION_COOKIE', 'benchmark')
+
+from advent_cli import leaderboard  # noqa: E402
+
+
+def make_members(count, seed=2021):
+    rng = random.Random(seed)
+    members = []
+    for i in range(count):
+        days = {str(d): {str(p): {'get_star_ts': rng.randrange(10**9), 'star_index': 0}
+                         for p in range(1, rng.choice([1, 2]) + 1)}
+                for d in range(1, 26) if rng.random() < 0.8}
+        members.append({'id': i, 'name': f'member{i}', 'local_score': rng.randrange(5000),
+                        'global_score': 0, 'stars': sum(map(len, days.values())),
+                        'last_star_ts': rng.randrange(10**9), 'completion_day_level': days})
+    return members
+
+
+def make_json(members):
+    return json.dumps({'owner_id': 0, 'event': '2021',
+                       'members': {str(m['id']): m for m in members}})
+
+
+def make_html(members):
+    rows = ['<div class="privboard-row">header</div>']
+    for position, m in enumerate(sorted(members, key=lambda m: -m['local_score']), start=1):
+        stars = ''.join(
+            '<span class="privboard-star-{}">*</span>'.format(
+                {2: 'both', 1: 'firstonly'}.get(len(m['completion_day_level'].get(str(d), {})),
+                                                'unlocked'))
+            for d in range(1, 26)
+        )
+        rows.append(f'<div class="privboard-row"><span class="privboard-position">'
+                    f'{position:>3})</span> {m["local_score"]} {stars} '
+                    f'<span class="privboard-name"><a href="https://github.com/{m["name"]}">'
+                    f'{m["name"]}</a></span></div>')
+    return ('<html><body><header><div class="user">member0</div></header><main><article>'
+            '<p>This is your private leaderboard for Advent of Code 2021.</p>'
+            + ''.join(rows) + '</article></main></body></html>')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--members', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    members = make_members(args.members)
+    json_text, html_text = make_json(members), make_html(members)
+
+    results = {
+        'json': min(timeit.repeat(lambda: leaderboard.parse_json(json_text, '2021'),
+                                  number=1, repeat=args.repeat)),
+        'html': min(timeit.repeat(lambda: leaderboard.parse_html(html_text),
+                                  number=1, repeat=args.repeat)),
+    }
+    print(f'{args.members} member board (best of {args.repeat})')
+    print(f'  html ({len(html_text) // 1024}KB): {results["html"] * 1000:8.2f}ms')
+    print(f'  json ({len(json_text) // 1024}KB): {results["json"] * 1000:8.2f}ms')
+    print(f'  speedup:       {results["html"] / results["json"]:8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,28 @@
 import os
+from contextlib import contextmanager
 import pytest
 from mock import patch
 
+from advent_cli import config
+
 
 @pytest.fixture(autouse=True)
-def env_patch_fixture():
+def env_patch_fixture(tmp_path):
     with patch.dict(os.environ, {'ADVENT_SESSION_COOKIE': '',
                                  'ADVENT_PRIV_BOARDS': '1111111',
-                                 'ADVENT_DISABLE_TERMCOLOR': '1'}):
+                                 'ADVENT_DISABLE_TERMCOLOR': '1',
+                                 'ADVENT_RESULTS_DB': str(tmp_path / 'results.db')}):
+        config.overrides.clear()
+        config.invalidate()
+        yield
+    config.overrides.clear()
+    config.invalidate()
+
+
+@contextmanager
+def patch_env(values):
+    # the configuration is cached, so it has to be rebuilt inside and after the patch
+    with patch.dict(os.environ, values):
+        config.invalidate()
         yield
+    config.invalidate()
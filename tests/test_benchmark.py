@@ -0,0 +1,90 @@
+from types import SimpleNamespace
+from mock import patch
+from _fixtures import env_patch_fixture
+
+from advent_cli import benchmark
+
+
+def test_autorange():
+    assert benchmark.autorange(lambda number: number * 30, 100) == 5
+    assert benchmark.autorange(lambda number: number * 30, 1000) == 50
+
+
+def test_summarize():
+    summary = benchmark.summarize([1, 2, 3, 4, 100])
+    assert summary['min'] == 1
+    assert summary['median'] == 3
+    assert 80 < summary['p95'] < 100
+    assert summary['stddev'] > 0
+
+
+def test_format_ns():
+    assert benchmark.format_ns(512) == '512ns'
+    assert benchmark.format_ns(1500) == '1.5µs'
+    assert benchmark.format_ns(2_340_000) == '2.34ms'
+    assert benchmark.format_ns(3 * 10**9) == '3s'
+
+
+class FakePuzzle:
+    created = 0
+    always_run_part_1 = True
+
+    def __init__(self):
+        FakePuzzle.created += 1
+        self.part1_done = False
+
+    def part1(self):
+        self.part1_done = True
+
+    def part2(self):
+        # would fail if part 1 was not run first on this instance
+        assert self.part1_done
+
+
+def test_benchmark_part_uses_fresh_puzzles():
+    FakePuzzle.created = 0
+    number, summary = benchmark.benchmark_part(FakePuzzle, 2, repeat=3, warmup=1, min_time=0)
+    assert number == 1
+    assert FakePuzzle.created == 5
+    assert set(summary) == {'min', 'median', 'p95', 'stddev'}
+
+
+class CountedPuzzle(FakePuzzle):
+    alive = 0
+    peak = 0
+
+    def __init__(self):
+        super().__init__()
+        CountedPuzzle.alive += 1
+        CountedPuzzle.peak = max(CountedPuzzle.peak, CountedPuzzle.alive)
+
+    def __del__(self):
+        CountedPuzzle.alive -= 1
+
+
+@patch.object(benchmark, 'BATCH_SIZE', 3)
+@patch.object(benchmark, 'autorange', return_value=7)
+def test_benchmark_part_builds_puzzles_in_batches(mock_autorange):
+    FakePuzzle.created = 0
+    number, _ = benchmark.benchmark_part(CountedPuzzle, 2, repeat=1, warmup=0)
+    assert number == 7
+    assert FakePuzzle.created == 7
+    assert CountedPuzzle.peak <= 3
+
+
+@patch.dict('os.environ', {'PYTHONHASHSEED': '0'})
+@patch('sys.flags', SimpleNamespace(hash_randomization=0))
+@patch('subprocess.run')
+def test_fixed_hash_seed_already_set(mock_run):
+    benchmark.ensure_fixed_hash_seed()
+    mock_run.assert_not_called()
+
+
+@patch.dict('os.environ', {'PYTHONHASHSEED': '0'})
+@patch('sys.flags', SimpleNamespace(hash_randomization=1))
+@patch('sys.exit')
+@patch('subprocess.run')
+def test_fixed_hash_seed_inherited_environment(mock_run, mock_exit):
+    # e.g. a daemon child, forked from an interpreter started without the seed
+    benchmark.ensure_fixed_hash_seed()
+    assert mock_run.call_args.kwargs['env']['PYTHONHASHSEED'] == '0'
@@ -0,0 +1,87 @@
+import os
+import pytest
+import requests
+from mock import patch
+from _fixtures import env_patch_fixture, patch_env
+
+from advent_cli import cache, client
+
+
+@pytest.fixture(autouse=True)
+def cache_dir_fixture(tmp_path):
+    cache.configure()
+    with patch_env({'ADVENT_CACHE_DIR': str(tmp_path)}):
+        yield tmp_path
+    cache.configure()
+
+
+def make_response(text, status_code=200, headers=None):
+    r = requests.Response()
+    r.status_code = status_code
+    r.headers.update(headers or {})
+    r.encoding = 'utf-8'
+    r._content = text.encode()
+    return r
+
+
+@patch('advent_cli.client.request')
+def test_fresh_entry_skips_network(mock_request):
+    mock_request.return_value = make_response('<article><pre>stats</pre></article>')
+    url = 'https://adventofcode.com/2099/leaderboard/self'
+    assert client.get(url).text == '<article><pre>stats</pre></article>'
+    assert client.get(url).text == '<article><pre>stats</pre></article>'
+    mock_request.assert_called_once()
+
+
+@patch('advent_cli.client.request')
+def test_stale_entry_is_revalidated(mock_request):
+    url = 'https://adventofcode.com/2099/day/1'
+    mock_request.side_effect = [
+        make_response('day page', headers={'ETag': '"abc"'}),
+        make_response('', status_code=304),
+    ]
+    client.get(url)
+    r = client.get(url)
+    assert r.status_code == 200
+    assert r.text == 'day page'
+    assert mock_request.call_args.kwargs['headers'] == {'If-None-Match': '"abc"'}
+
+
+@patch('advent_cli.client.request')
+def test_refresh_and_disabled(mock_request):
+    mock_request.return_value = make_response('input')
+    url = 'https://adventofcode.com/2099/day/1/input'
+    client.get(url)
+    cache.configure(refresh=True)
+    client.get(url)
+    cache.configure(enabled=False)
+    client.get(url)
+    assert mock_request.call_count == 3
+    assert 'headers' not in mock_request.call_args.kwargs
+
+
+@patch('advent_cli.client.request')
+def test_logged_out_and_uncacheable_pages(mock_request):
+    mock_request.return_value = make_response('[Log In]')
+    client.get('https://adventofcode.com/2099/leaderboard/self')
+    client.get('https://adventofcode.com/2099/leaderboard/self')
+    client.get('https://adventofcode.com/2099/day/1/answer')
+    assert mock_request.call_count == 3
+
+
+def test_lru_eviction(cache_dir_fixture):
+    with patch_env({'ADVENT_CACHE_SIZE': str(2500 / 1024 / 1024)}):
+        for i, url in enumerate(['a', 'b', 'c']):
+            cache.store(url, url, {}, b'x' * 1000)
+            os.utime(cache_dir_fixture / f'{url}.json', (i, i))
+            if url == 'b':
+                cache.touch('a')
+    assert cache.load('a') is not None
+    assert cache.load('b') is None
+    assert cache.load('c') is not None
+
+
+def test_cache_key():
+    url = 'https://adventofcode.com/2099/leaderboard/self'
+    assert cache.cache_key(url, 'one') != cache.cache_key(url, 'two')
+    assert 'one' not in cache.cache_key(url, 'one')
@@ -62,3 +62,35 @@ def test_cli_countdown(mock_argparse, mock_command_submit):
     mock_argparse.return_value.parse_args.return_value.command = 'countdown'
     cli.main()
     mock_command_submit.assert_called_once_with('2099', '99')
+
+
+@patch('advent_cli.cli.commands.bench')
+@patch('argparse.ArgumentParser')
+def test_cli_bench(mock_argparse, mock_command_bench):
+    args = mock_argparse.return_value.parse_args.return_value
+    args.date = '2099/99'
+    args.command = 'bench'
+    args.solution_file = 'solution'
+    args.puzzle_part = '0'
+    args.repeat = 5
+    args.warmup = 1
+    args.min_time = 0.1
+    args.low_noise = False
+    cli.main()
+    mock_command_bench.assert_called_once_with('2099', '99', solution_file='solution',
+                                               part='0', repeat=5, warmup=1, min_time=0.1,
+                                               low_noise=False)
+
+
+@patch('advent_cli.cli.daemon.forward')
+@patch('advent_cli.cli.commands.bench')
+@patch('argparse.ArgumentParser')
+def test_cli_bench_low_noise_not_forwarded(mock_argparse, mock_command_bench, mock_forward):
+    args = mock_argparse.return_value.parse_args.return_value
+    args.date = '2099/99'
+    args.command = 'bench'
+    args.low_noise = True
+    with patch('sys.argv', ['advent', 'bench', '--low-noise']):
+        cli.main()
+    mock_forward.assert_not_called()
+    mock_command_bench.assert_called_once()
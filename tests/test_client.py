@@ -0,0 +1,72 @@
+import os
+import pytest
+from mock import MagicMock, patch
+from _fixtures import env_patch_fixture
+
+from advent_cli import client
+
+
+@pytest.fixture(autouse=True)
+def fresh_session():
+    client.close_session()
+    yield
+    client.close_session()
+
+
+def test_session_is_reused():
+    assert client.get_session() is client.get_session()
+
+
+def test_session_pool_and_retries():
+    with patch.dict(os.environ, {'ADVENT_HTTP_RETRIES': '5', 'ADVENT_HTTP_POOL_SIZE': '3'}):
+        adapter = client.get_session().get_adapter('https://adventofcode.com/')
+    assert adapter.max_retries.total == 5
+    assert 'POST' not in adapter.max_retries.allowed_methods
+    assert adapter._pool_maxsize == 3
+
+
+@patch.dict(os.environ, {'ADVENT_SESSION_COOKIE': 'abc', 'ADVENT_HTTP_TIMEOUT': '2.5'})
+def test_request_defaults():
+    with patch.object(client.get_session(), 'request') as mock_request:
+        client.get('https://adventofcode.com/2099/day/1')
+        client.post('https://adventofcode.com/2099/day/1/answer', data={'level': 1})
+    get_call, post_call = mock_request.call_args_list
+    assert get_call.args == ('GET', 'https://adventofcode.com/2099/day/1')
+    assert get_call.kwargs == {'cookies': {'session': 'abc'}, 'timeout': 2.5}
+    assert post_call.args[0] == 'POST'
+    assert post_call.kwargs['data'] == {'level': 1}
+
+
+@patch('time.sleep')
+@patch.dict(os.environ, {'ADVENT_HTTP_RETRIES': '3'})
+def test_error_statuses_retried_through_limiter(mock_sleep):
+    responses = [MagicMock(status_code=503), MagicMock(status_code=200)]
+    session, limiter = client.get_session(), client.get_limiter()
+    with patch.object(session, 'request', side_effect=responses) as mock_request, \
+            patch.object(limiter, 'wait') as mock_wait:
+        r = client.request('GET', 'https://adventofcode.com/2099/day/1/input')
+    assert r.status_code == 200
+    assert mock_request.call_count == 2
+    assert mock_wait.call_count == 2
+    assert mock_sleep.call_count == 1
+
+
+@patch('time.sleep')
+def test_post_not_retried(mock_sleep):
+    with patch.object(client.get_session(), 'request',
+                      return_value=MagicMock(status_code=503)) as mock_request:
+        r = client.post('https://adventofcode.com/2099/day/1/answer', data={'level': 1})
+    assert r.status_code == 503
+    assert mock_request.call_count == 1
+
+
+@patch('time.sleep')
+def test_rate_limiter_spaces_requests(mock_sleep):
+    limiter = client.RateLimiter(2)
+    limiter.wait()
+    limiter.wait()
+    limiter.wait()
+    delays = [c.args[0] for c in mock_sleep.call_args_list]
+    assert len(delays) == 2
+    assert 0.4 < delays[0] <= 0.5
+    assert 0.9 < delays[1] <= 1.0
@@ -0,0 +1,61 @@
+import os
+import pytest
+from mock import patch
+from _fixtures import env_patch_fixture
+
+from advent_cli import config
+
+
+@pytest.fixture(autouse=True)
+def config_dir_fixture(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    yield tmp_path
+
+
+def test_config_is_cached():
+    conf = config.get_config()
+    assert config.get_config() is conf
+    with patch.dict(os.environ, {'ADVENT_HTTP_TIMEOUT': '2.5'}):
+        assert config.get_config().http_timeout == 10.0
+        config.invalidate()
+        assert config.get_config().http_timeout == 2.5
+
+
+def test_typed_attributes():
+    conf = config.get_config()
+    assert conf.private_leaderboards == ['1111111']
+    assert conf.disable_color is True
+    assert conf.http_retries == 3
+    assert conf.cache_enabled is True
+    assert conf.year is None
+
+
+def test_layers(config_dir_fixture):
+    (config_dir_fixture / config.CONFIG_FILE).write_text(
+        '[DEFAULT]\nyear = 2099\nday = 03\nhttp_timeout = 4\n'
+    )
+    with patch.dict(os.environ, {'ADVENT_HTTP_TIMEOUT': '2.5', 'ADVENT_HTTP_RETRIES': '5',
+                                 'ADVENT_DAY': '01'}):
+        config.override(cache_refresh=True)
+        conf = config.get_config()
+    assert (conf.year, conf.day) == ('2099', '03')
+    assert conf.http_timeout == 4.0
+    assert conf.http_retries == 5
+    assert conf.cache_refresh is True
+
+
+def test_save_file_keeps_other_keys(config_dir_fixture):
+    config.save_file(year='2099', day='01')
+    config.save_file(day='02')
+    conf = config.get_config()
+    assert (conf.year, conf.day) == ('2099', '02')
+
+
+def test_session_cookie_checked_lazily(capsys):
+    with patch.dict(os.environ):
+        del os.environ['ADVENT_SESSION_COOKIE']
+        conf = config.get_config()
+    assert conf.disable_color is True
+    with pytest.raises(SystemExit):
+        conf.session_cookie
+    assert 'Session cookie not set.' in capsys.readouterr().out
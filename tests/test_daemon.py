@@ -0,0 +1,63 @@
+import os
+import threading
+from mock import patch
+from _fixtures import env_patch_fixture
+
+from advent_cli import commands, daemon
+
+
+SOLUTION = '''class Puzzle:
+    always_run_part_1 = False
+
+    def __init__(self, lines, is_test=False):
+        self.nums = [int(line) for line in lines]
+
+    def part1(self):
+        return sum(self.nums)
+
+    def part2(self):
+        return None
+'''
+
+
+def test_forward_without_daemon(tmp_path, monkeypatch):
+    monkeypatch.setenv('ADVENT_DAEMON_SOCKET', str(tmp_path / 'daemon.sock'))
+    assert daemon.forward(['test', '-d', '2099/01']) is None
+
+
+def test_forward_to_daemon(tmp_path, monkeypatch, capfd):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('ADVENT_DAEMON_SOCKET', str(tmp_path / 'daemon.sock'))
+    for day, input in (('01', '1\n2\n'), ('02', 'x\n')):
+        os.makedirs(f'2070/{day}')
+        with open(f'2070/{day}/solution.py', 'w') as f:
+            f.write(SOLUTION)
+        with open(f'2070/{day}/input.txt', 'w') as f:
+            f.write(input)
+
+    server = daemon.Server(str(tmp_path / 'daemon.sock'), daemon.RequestHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    try:
+        assert daemon.forward(['test', '-d', '2070/01']) == 0
+        assert 'ms): 3\n' in capfd.readouterr().out
+        assert daemon.forward(['test', '-d', '2070/02']) == 1
+        assert 'ValueError' in capfd.readouterr().err
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+@patch('advent_cli.daemon.serve')
+@patch('advent_cli.daemon.connect')
+def test_unsupported_platform(mock_connect, mock_serve, capsys):
+    with patch('advent_cli.daemon.supported', False):
+        assert daemon.forward(['test', '-d', '2099/01']) is None
+        commands.start_daemon()
+        commands.stop_daemon()
+    mock_connect.assert_not_called()
+    mock_serve.assert_not_called()
+    message = ('advent daemon is not supported on this platform, it needs Unix sockets '
+               'and fork.')
+    assert capsys.readouterr().out == f'{message}\n{message}\n'
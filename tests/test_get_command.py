@@ -1,12 +1,15 @@
+from concurrent.futures import ThreadPoolExecutor
+from freezegun import freeze_time
 from mock import patch, call, mock_open, MagicMock
 from _fixtures import env_patch_fixture
 
 from advent_cli import commands
+from advent_cli.config import CONFIG_FILE
 
 
 @patch('os.makedirs')
 @patch('builtins.open', new_callable=mock_open())
-@patch('requests.get')
+@patch('advent_cli.client.get')
 def test_get(mock_get, mock_open, mock_mkdir):
     mock_get.side_effect = [
         MagicMock(text='''
@@ -48,7 +51,7 @@ def test_get_path_exists(mock_exists, mock_open):
 
 
 @patch('builtins.open', new_callable=mock_open())
-@patch('requests.get')
+@patch('advent_cli.client.get')
 def test_get_puzzle_locked(mock_get, mock_open):
     mock_get.return_value.status_code = 404
     mock_get.return_value.text = ('Please don\'t repeatedly request '
@@ -58,9 +61,53 @@ def test_get_puzzle_locked(mock_get, mock_open):
 
 
 @patch('builtins.open', new_callable=mock_open())
-@patch('requests.get')
+@patch('advent_cli.client.get')
 def test_get_404(mock_get, mock_open):
     mock_get.return_value.status_code = 404
     mock_get.return_value.text = '404 Not Found'
     commands.get('2099', '99')
     mock_open.assert_not_called()
+
+
+def make_day_page(day):
+    return MagicMock(status_code=200, text=(
+        f'<article class="day-desc"><h2>--- Day {day}: Test ---</h2></article>'
+    ))
+
+
+@patch('advent_cli.commands.unlocked_days', return_value=25)
+@patch('advent_cli.commands.set_day')
+@patch('importlib.resources.read_text', return_value='template')
+@patch('concurrent.futures.ProcessPoolExecutor', ThreadPoolExecutor)
+@patch('os.makedirs')
+@patch('builtins.open', new_callable=mock_open())
+@patch('os.path.exists', side_effect=lambda path: path not in ('2099/03/', '2099/25/'))
+@patch('advent_cli.client.get')
+def test_get_all(mock_get, mock_exists, mock_open, mock_mkdir, mock_read_text, mock_set_day,
+                 mock_unlocked):
+    mock_get.side_effect = lambda url: (
+        MagicMock(status_code=200, text=f'input for {url.split("/")[-2]}')
+        if url.endswith('/input') else make_day_page(url.split('/')[-1])
+    )
+    commands.get_all('2099')
+    assert mock_get.call_count == 4
+    assert mock_mkdir.call_args_list == [call('2099/03/'), call('2099/25/')]
+    # reading the configuration file isn't one of the downloads
+    written = {c.args[0]: c for c in mock_open.call_args_list if c.args[0] != CONFIG_FILE}
+    assert sorted(written) == ['2099/03/input.txt', '2099/03/prompt.md', '2099/03/solution.py',
+                               '2099/25/input.txt', '2099/25/prompt.md', '2099/25/solution.py']
+    handle = mock_open.return_value.__enter__.return_value
+    writes = [c.args[0] for c in handle.write.call_args_list]
+    assert 'input for 3' in writes
+    assert 'input for 25' in writes
+    assert any('Day 25: Test' in text for text in writes)
+    mock_set_day.assert_called_once_with('25')
+
+
+@freeze_time('2099-12-02 12:00:00')
+@patch('os.path.exists', return_value=True)
+@patch('advent_cli.client.get')
+def test_get_all_nothing_to_do(mock_get, mock_exists, capsys):
+    commands.get_all('2099')
+    mock_get.assert_not_called()
+    assert 'Nothing to download' in capsys.readouterr().out
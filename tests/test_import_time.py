@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+
+import advent_cli
+
+# generous, a cold start is around 15ms, this only catches a heavy import sneaking back in
+BUDGET_MS = 100
+HEAVY_MODULES = ('bs4', 'curses', 'markdownify', 'multiprocessing', 'pytz', 'requests',
+                 'tabulate')
+
+
+def run_python(code):
+    env = {**os.environ, 'ADVENT_SESSION_COOKIE': 'test'}
+    return subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          capture_output=True, text=True, env=env, check=True)
+
+
+def test_cli_does_not_import_heavy_modules():
+    # lazily imported modules sit in sys.modules unexecuted, importtime lists what really ran
+    result = run_python('import advent_cli.cli')
+    loaded = {line.split('|')[2].strip().split('.')[0]
+              for line in result.stderr.splitlines()[1:]}
+    assert not loaded & set(HEAVY_MODULES)
+
+
+def test_cli_import_time_within_budget():
+    # best of a few runs, the first one may still be compiling .pyc files
+    timings = []
+    for _ in range(3):
+        for line in run_python('import advent_cli.cli').stderr.splitlines():
+            if line.endswith('| advent_cli.cli'):
+                timings.append(int(line.split('|')[1]))
+    assert min(timings) / 1000 < BUDGET_MS
+
+
+def test_import_does_not_write_config(tmp_path):
+    subprocess.run([sys.executable, '-c', 'import advent_cli.commands'], cwd=tmp_path,
+                   env={**os.environ, 'ADVENT_SESSION_COOKIE': 'test',
+                        'PYTHONPATH': os.path.dirname(os.path.dirname(advent_cli.__file__))},
+                   check=True)
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,85 @@
+import pytest
+from _fixtures import env_patch_fixture
+
+from advent_cli import inputs, runner
+
+
+class Puzzle:
+    pass
+
+
+def puzzle_with(mode):
+    return type('Puzzle', (), {'input_mode': mode})
+
+
+@pytest.fixture
+def input_fixture(tmp_path):
+    path = tmp_path / 'input.txt'
+    path.write_text('1\n2\n3\n')
+    return inputs.InputFile(str(path))
+
+
+def test_default_mode_is_lines(input_fixture):
+    assert inputs.input_mode(Puzzle) == 'lines'
+    assert inputs.for_puzzle(input_fixture, Puzzle) == ['1', '2', '3']
+
+
+def test_modes(input_fixture):
+    assert inputs.for_puzzle(input_fixture, puzzle_with('text')) == '1\n2\n3\n'
+    view = inputs.for_puzzle(input_fixture, puzzle_with('mmap'))
+    assert isinstance(view, memoryview)
+    assert view.tobytes() == b'1\n2\n3\n'
+    with pytest.raises(TypeError):
+        view[0] = 0
+
+
+def test_line_stream_passes_are_independent(input_fixture):
+    lines = inputs.for_puzzle(input_fixture, puzzle_with('iter'))
+    assert not isinstance(lines, list)
+    first = iter(lines)
+    assert next(first) == '1'
+    assert list(lines) == ['1', '2', '3']
+    assert list(first) == ['2', '3']
+
+
+def test_empty_file_mmap(tmp_path):
+    (tmp_path / 'input.txt').write_text('')
+    input = inputs.InputFile(str(tmp_path / 'input.txt'))
+    assert inputs.for_puzzle(input, puzzle_with('mmap')).tobytes() == b''
+
+
+def test_example_lines():
+    assert inputs.for_puzzle(['1', '2'], puzzle_with('iter')) == ['1', '2']
+    assert inputs.for_puzzle(['1', '2'], puzzle_with('text')) == '1\n2\n'
+    assert inputs.for_puzzle(['1', '2'], puzzle_with('mmap')).tobytes() == b'1\n2\n'
+
+
+def test_unknown_mode(input_fixture):
+    with pytest.raises(ValueError, match='input_mode must be one of'):
+        inputs.for_puzzle(input_fixture, puzzle_with('bytes'))
+
+
+STREAMING_SOLUTION = '''class Puzzle:
+    always_run_part_1 = False
+    input_mode = 'iter'
+
+    def __init__(self, lines, is_test=False):
+        self.lines = lines
+
+    def part1(self):
+        return sum(int(line) for line in self.lines)
+
+    def part2(self):
+        return max(int(line) for line in self.lines)
+'''
+
+
+def test_streaming_solution(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / '2088' / '01'
+    path.mkdir(parents=True)
+    (path / 'solution.py').write_text(STREAMING_SOLUTION)
+    (path / 'input.txt').write_text('1\n2\n3\n')
+    result = runner.run_day('2088', '01')
+    assert result.error is None
+    assert (result.part1, result.part2) == (6, 3)
@@ -0,0 +1,65 @@
+import json
+from freezegun import freeze_time
+from _fixtures import env_patch_fixture
+
+from advent_cli import leaderboard
+
+
+def make_board(members, owner_id=1):
+    return json.dumps({'owner_id': owner_id, 'event': '2099', 'members': {
+        str(m['id']): m for m in members
+    }})
+
+
+def make_member(id, score, last_star_ts=0, days=None, name='name'):
+    return {'id': id, 'name': name, 'local_score': score, 'last_star_ts': last_star_ts,
+            'completion_day_level': {str(d): {str(p): {} for p in range(1, parts + 1)}
+                                     for d, parts in (days or {}).items()}}
+
+
+@freeze_time('2099-12-03 05:00:00')
+def test_parse_json_star_states():
+    board = leaderboard.parse_json(make_board([make_member(1, 10, days={1: 2, 3: 1})]), '2099')
+    assert board.members[0].stars == '201' + ' ' * 22
+
+
+@freeze_time('2100-06-01')
+def test_parse_json_past_year_fully_unlocked():
+    board = leaderboard.parse_json(make_board([make_member(1, 0)]), '2099')
+    assert board.members[0].stars == '0' * 25
+
+
+@freeze_time('2099-12-03 05:00:00')
+def test_parse_json_ordering_and_owner():
+    board = leaderboard.parse_json(make_board([
+        make_member(1, 5, last_star_ts=3, name='owner'),
+        make_member(2, 5, last_star_ts=2, name='faster'),
+        make_member(3, 8, name=None),
+    ]), '2099')
+    assert board.owner == 'owner'
+    assert [(m.position, m.name) for m in board.members] == [
+        (1, '(anonymous user #3)'), (2, 'faster'), (None, 'owner')
+    ]
+
+
+@freeze_time('2099-12-03 05:00:00')
+def test_parse_json_links():
+    linked = make_member(1, 5)
+    linked['link'] = 'https://example.com'
+    board = leaderboard.parse_json(make_board([linked, make_member(2, 3)]), '2099')
+    assert [m.link for m in board.members] == ['https://example.com', None]
+
+
+def test_parse_html():
+    board = leaderboard.parse_html(
+        '<article><p>This is the private leaderboard of someone for Advent of Code 2099.'
+        '</p><div class="privboard-row"></div><div class="privboard-row">'
+        '<span class="privboard-position">10)</span>123'
+        '<span class="privboard-star-firstonly">*</span>'
+        '<span class="privboard-star-locked">*</span>'
+        '<span class="privboard-name"><a href="https://example.com">someone</a></span>'
+        '</div></article>'
+    )
+    assert board == leaderboard.Board('someone', [
+        leaderboard.Member(10, 123, '1 ', 'someone', 'https://example.com')
+    ])
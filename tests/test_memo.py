@@ -0,0 +1,91 @@
+import hashlib
+import sys
+import pytest
+from mock import patch
+from _fixtures import env_patch_fixture, patch_env
+
+from advent_cli import commands, memo
+from advent_cli.utils import compute_answers
+
+
+SOLUTION = '''from .helper import double
+import common
+
+
+class Puzzle:
+    always_run_part_1 = False
+
+    def __init__(self, lines, is_test=False):
+        self.nums = [int(line) for line in lines]
+
+    def part1(self):
+        return double(sum(self.nums))
+
+    def part2(self):
+        return common.VALUE
+'''
+
+
+@pytest.fixture(autouse=True)
+def day_fixture(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    path = tmp_path / '2086' / '01'
+    path.mkdir(parents=True)
+    (path / 'solution.py').write_text(SOLUTION)
+    (path / 'helper.py').write_text('from common import VALUE\n\n\n'
+                                    'def double(x):\n    return 2 * x\n')
+    (path / 'input.txt').write_text('1\n2\n3\n')
+    (tmp_path / 'common.py').write_text('VALUE = 7\n')
+    with patch_env({'ADVENT_CACHE_DIR': str(tmp_path / 'cache')}):
+        yield path
+    for name in [name for name in sys.modules if name.startswith(('2086', 'common'))]:
+        del sys.modules[name]
+
+
+def key():
+    return memo.answer_key('2086', '01', 'solution', '2086/01/input.txt')
+
+
+def test_source_files():
+    assert memo.source_files('2086', '01') == ['2086/01/solution.py', '2086/01/helper.py',
+                                               'common.py']
+
+
+def test_key_follows_local_imports(tmp_path, day_fixture):
+    before = key()
+    (tmp_path / 'common.py').write_text('VALUE = 8\n')
+    assert key() != before
+    after = key()
+    (day_fixture / 'unrelated.py').write_text('x = 1\n')
+    assert key() == after
+    (day_fixture / 'input.txt').write_text('1\n')
+    assert key() != after
+
+
+def test_file_digest_reads_in_chunks(tmp_path):
+    data = bytes(range(256)) * 5000
+    (tmp_path / 'big.txt').write_bytes(data)
+    assert memo.file_digest(tmp_path / 'big.txt') == hashlib.sha256(data).digest()
+
+
+def test_partial_entries():
+    memo.store(key(), 12, None, 1, 0, part=1)
+    assert memo.lookup(key(), 1)[:4] == ('12', None, 1, 0)
+    assert memo.lookup(key(), 0) is None
+    memo.store(key(), None, 7, 0, 2, part=2)
+    assert memo.lookup(key(), 0)[:4] == ('12', '7', 1, 2)
+
+
+def test_test_command_uses_saved_answers(capsys):
+    commands.test('2086', '01')
+    assert 'Part 1 (Time: ' in capsys.readouterr().out
+    with patch('advent_cli.commands.compute_answers') as mock_compute:
+        commands.test('2086', '01')
+        mock_compute.assert_not_called()
+    out = capsys.readouterr().out
+    assert 'using saved answers' in out
+    assert 'Part 1 (Time: ' in out and '): 12' in out and '): 7' in out
+    with patch('advent_cli.commands.compute_answers', wraps=compute_answers) as mock_compute:
+        commands.test('2086', '01', force=True)
+        mock_compute.assert_called_once()
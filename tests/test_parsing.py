@@ -0,0 +1,34 @@
+from mock import patch
+from _fixtures import env_patch_fixture, patch_env
+
+from advent_cli import config, parsing
+
+PAGE = ('<html><head><script>var x = "<article>";</script></head><body>'
+        '<header><div class="user">Your Name</div></header>'
+        '<main><article><p>intro</p><pre>table</pre></article>'
+        '<p>Your puzzle answer was <code>5</code>.</p></main></body></html>')
+
+
+def test_parser_name_falls_back_without_lxml():
+    config.override(html_parser=None)
+    with patch('bs4.builder.builder_registry.lookup', return_value=None):
+        assert parsing.parser_name() == 'html.parser'
+    with patch('bs4.builder.builder_registry.lookup', return_value=object()):
+        assert parsing.parser_name() == 'lxml'
+
+
+def test_parser_name_from_config():
+    with patch_env({'ADVENT_HTML_PARSER': 'html.parser'}):
+        with patch('bs4.builder.builder_registry.lookup', return_value=object()):
+            assert parsing.parser_name() == 'html.parser'
+
+
+def test_parse_only_targets():
+    soup = parsing.parse(PAGE, parsing.STATS_PAGE)
+    assert soup.decode() == '<article><p>intro</p><pre>table</pre></article>'
+    soup = parsing.parse(PAGE, parsing.DAY_PAGE)
+    assert [p.text for p in soup.find_all('p')] == ['intro', 'Your puzzle answer was 5.']
+    soup = parsing.parse(PAGE, parsing.LEADERBOARD_PAGE)
+    assert soup.find('div', class_='user').text == 'Your Name'
+    assert soup.find('script') is None
+    assert parsing.parse(PAGE).find('script') is not None
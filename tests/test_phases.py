@@ -0,0 +1,33 @@
+import tracemalloc
+from _fixtures import env_patch_fixture
+
+from advent_cli.phases import PhaseRecorder, format_bytes
+
+
+def test_memory_per_phase():
+    recorder = PhaseRecorder(memory=True)
+    kept = []
+    with recorder.phase('part1'):
+        [0] * 1_000_000
+    with recorder.phase('part2'):
+        kept.append(bytearray(2_000_000))
+    part1, part2 = recorder.phases
+    assert part1.peak_bytes >= 8_000_000
+    assert part1.net_bytes < 100_000
+    assert part2.net_bytes >= 2_000_000
+    assert part2.max_rss_bytes >= part2.net_bytes
+    assert not tracemalloc.is_tracing()
+
+
+def test_memory_disabled():
+    recorder = PhaseRecorder()
+    with recorder.phase('part1'):
+        pass
+    assert recorder.get('part1').peak_bytes is None
+
+
+def test_format_bytes():
+    assert format_bytes(512) == '512B'
+    assert format_bytes(1536) == '1.5KiB'
+    assert format_bytes(-3 * 1024**2) == '-3MiB'
+    assert format_bytes(5 * 1024**3) == '5GiB'
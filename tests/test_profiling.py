@@ -0,0 +1,44 @@
+import sys
+import time
+from _fixtures import env_patch_fixture
+
+from advent_cli import profiling
+from advent_cli.phases import PhaseRecorder
+
+
+def busy_leaf(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def busy_root():
+    busy_leaf(0.1)
+
+
+def test_recorder_profiles_each_phase():
+    recorder = PhaseRecorder(profile=True)
+    with recorder.phase('part1'):
+        busy_root()
+    assert list(recorder.profiles) == ['part1']
+    top = profiling.format_top(recorder.profiles['part1'], 5)
+    assert top.split('\n')[0].split() == ['ncalls', 'tottime', 'percall', 'cumtime', 'percall',
+                                          'filename:lineno(function)']
+    assert 'busy_leaf' in top
+
+
+def test_stack_sampler_collapsed_output(tmp_path):
+    switch_interval = sys.getswitchinterval()
+    recorder = PhaseRecorder(sample_stacks=True)
+    with recorder.phase('part2'):
+        busy_root()
+    assert sys.getswitchinterval() == switch_interval
+
+    path = tmp_path / 'solution.part2.collapsed'
+    recorder.samplers['part2'].write_collapsed(path)
+    lines = path.read_text().strip().split('\n')
+    stack, count = lines[0].rsplit(' ', 1)
+    # stacks start at the code run inside the phase, not at the test harness
+    assert stack.startswith('busy_root (test_profiling.py:')
+    assert 'busy_leaf' in stack
+    assert int(count) > 0
@@ -0,0 +1,129 @@
+import sqlite3
+
+import pytest
+from mock import patch, MagicMock
+from _fixtures import env_patch_fixture
+
+from advent_cli import commands, config, results
+
+
+@pytest.fixture(autouse=True)
+def workspace_fixture(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    yield tmp_path
+
+
+def write_day(tmp_path, year, day, files):
+    path = tmp_path / year / day
+    path.mkdir(parents=True, exist_ok=True)
+    for name, text in files.items():
+        (path / name).write_text(text)
+
+
+def test_imports_text_files_once(tmp_path):
+    write_day(tmp_path, '2085', '01', {
+        'correct_results.txt': 'Puzzle 2085/01 Part 1 : Result for 2085-12-01 06:00:00\n'
+                               'Part1 Answer: 10\nExecution Time: 12ms\n\n',
+        'incorrect_results.txt': 'Puzzle 2085/01 Part 2 : Failed Result for '
+                                 '2085-12-01 06:05:00\n'
+                                 'Part2 Incorrect Answer: 99\nExecution Time: 3ms\n\n',
+    })
+    write_day(tmp_path, '2085', '02', {
+        'correct_results.txt': 'Puzzle 2085/02 Part 1 : Result for 2085-12-02 06:00:00\n'
+                               'Part1 Answer: 1\nExecution Time: 1ms\n\n',
+        'prompt_results.txt': 'Puzzle 2085/02 : Correct Answers retrieved from prompt on '
+                              '2085-12-02 07:00:00\n'
+                              'Part1: Your puzzle answer was <code>2</code>.\n'
+                              'Part2: Your puzzle answer was <code>3</code>.\n',
+    })
+    assert results.expected_answers('2085', '01') == ('10', None)
+    # the puzzle page wins over what was submitted
+    assert results.expected_answers('2085', '02') == ('2', '3')
+    assert results.expected_answers_for_year('2085') == {'01': ('10', None), '02': ('2', '3')}
+    with results.connect() as db:
+        assert db.execute('SELECT answer, time_ms FROM results WHERE verdict = ?',
+                          (results.INCORRECT,)).fetchall() == [('99', 3)]
+
+    (tmp_path / '2085' / '01' / 'correct_results.txt').write_text('Part1 Answer: 11\n')
+    assert results.expected_answers('2085', '01') == ('10', None)
+
+
+def test_record_and_lookup():
+    assert results.expected_answers('2085', '03') == (None, None)
+    commands.record_result('2085', '03', True, 1, 5, 10, 'abc')
+    commands.record_result('2085', '03', False, 2, 7, 10)
+    assert results.expected_answers('2085', '03') == ('5', None)
+    commands.record_result('2085', '03', True, 1, 6, 10)
+    assert commands.get_expected_from_from_saved('2085', '03') == ('6', None)
+    with results.connect() as db:
+        plan = ' '.join(row[-1] for row in db.execute(
+            'EXPLAIN QUERY PLAN SELECT answer FROM results WHERE year = ? AND day = ? '
+            'AND part = ? AND verdict = ?', ('2085', '03', 1, results.CORRECT)))
+    assert 'results_by_day' in plan
+
+
+@patch('advent_cli.client.get')
+def test_save_results_from_prompt(mock_get):
+    mock_get.return_value = MagicMock(text='<p>Your puzzle answer was <code>42</code>.</p>'
+                                           '<p>Your puzzle answer was <code>43</code>.</p>')
+    commands.save_results_from_prompt('2085', '04')
+    commands.save_results_from_prompt('2085', '04')
+    mock_get.assert_called_once()
+    assert results.expected_answers('2085', '04') == ('42', '43')
+
+
+@patch('advent_cli.client.get')
+def test_prompt_results_fetched_until_both_parts_shown(mock_get):
+    part1 = '<p>Your puzzle answer was <code>11</code>.</p>'
+    # only part 1 was solved when the page was first read
+    commands.save_results_from_prompt('2085', '08', commands.parse_day_page(part1))
+    part2 = '<p>Your puzzle answer was <code>12</code>.</p>'
+    mock_get.return_value = MagicMock(text=part1 + part2)
+    commands.save_results_from_prompt('2085', '08')
+    commands.save_results_from_prompt('2085', '08')
+    mock_get.assert_called_once()
+    assert results.expected_answers('2085', '08') == ('11', '12')
+
+    # day 25 never shows an answer for part 2
+    commands.save_results_from_prompt('2085', '25', commands.parse_day_page(part1))
+    commands.save_results_from_prompt('2085', '25')
+    mock_get.assert_called_once()
+
+
+def test_known_wrong():
+    assert results.known_wrong('2085', '05', 1, 50) is None
+    commands.record_result('2085', '05', False, 1, 'abc', 10)
+    commands.record_result('2085', '05', False, 1, 20, 10, bound='low')
+    commands.record_result('2085', '05', False, 1, 80, 10, bound='high')
+    commands.record_result('2085', '05', False, 1, 30, 10, bound='low')
+    assert 'already rejected' in results.known_wrong('2085', '05', 1, 'abc')
+    assert 'already rejected' in results.known_wrong('2085', '05', 1, 80)
+    assert results.known_wrong('2085', '05', 1, 25) == '25 is not above 30, which was too low'
+    assert results.known_wrong('2085', '05', 1, 90) == '90 is not below 80, which was too high'
+    assert results.known_wrong('2085', '05', 1, 50) is None
+    assert results.known_wrong('2085', '05', 1, 'xyz') is None
+    assert results.known_wrong('2085', '05', 2, 25) is None
+
+
+@patch('advent_cli.commands.submit_answer')
+@patch('advent_cli.commands.run_solution',
+       return_value=(25, None, 1, None, commands.RunStatus.OK, None))
+@patch('advent_cli.memo.answer_key', return_value='key')
+@patch('advent_cli.commands.check_solution_exists', return_value=True)
+def test_submit_refuses_known_wrong(mock_exists, mock_key, mock_run, mock_submit, capsys):
+    commands.record_result('2085', '06', False, 1, 30, 10, bound='low')
+    commands.submit('2085', '06')
+    mock_submit.assert_not_called()
+    assert 'Not submitting part 1: 25 is not above 30' in capsys.readouterr().out
+
+
+def test_migrates_older_database():
+    db = sqlite3.connect(config.get_config().results_db)
+    db.executescript(results.MIGRATIONS[0])
+    db.execute("INSERT INTO results VALUES ('2085', '07', 1, '5', 'correct', 1, NULL, '')")
+    db.execute('PRAGMA user_version = 1')
+    db.commit()
+    db.close()
+    commands.record_result('2085', '07', False, 2, 9, 1, bound='high')
+    assert results.expected_answers('2085', '07') == ('5', None)
+    assert results.known_wrong('2085', '07', 2, 10) is not None
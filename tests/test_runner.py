@@ -0,0 +1,255 @@
+from concurrent.futures import ThreadPoolExecutor
+from mock import patch
+from _fixtures import env_patch_fixture
+
+from advent_cli import commands, runner
+from advent_cli.phases import PhaseRecorder
+from advent_cli.utils import RunStatus
+
+
+SOLUTION = '''class Puzzle:
+    always_run_part_1 = False
+
+    def __init__(self, lines, is_test=False):
+        print('parsing')
+        self.nums = [int(line) for line in lines]
+
+    def part1(self):
+        return sum(self.nums)
+
+    def part2(self):
+        return max(self.nums)
+'''
+
+
+def make_day(tmp_path, year, day, solution=SOLUTION, input='1\n2\n3\n', expected=None):
+    path = tmp_path / year / day
+    path.mkdir(parents=True)
+    (path / 'solution.py').write_text(solution)
+    (path / 'input.txt').write_text(input)
+    if expected is not None:
+        (path / 'correct_results.txt').write_text(''.join(
+            f'Part{part} Answer: {answer}\n' for part, answer in enumerate(expected, 1)
+        ))
+
+
+def test_solved_days(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    make_day(tmp_path, '2097', '01')
+    make_day(tmp_path, '2097', '03')
+    (tmp_path / '2097' / '02').mkdir()
+    assert runner.solved_days('2097') == ['01', '03']
+
+
+def test_run_day(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    make_day(tmp_path, '2096', '01')
+    result = runner.run_day('2096', '01')
+    assert (result.day, result.part1, result.part2, result.error) == ('01', 6, 3, None)
+    assert result.wall_ns > 0
+    assert capsys.readouterr().out == ''
+
+
+def test_run_day_error(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    make_day(tmp_path, '2095', '01', input='1\nx\n')
+    result = runner.run_day('2095', '01')
+    assert result.part1 is None
+    assert result.error.startswith('ValueError')
+
+
+def test_test_all(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    make_day(tmp_path, '2094', '01', expected=(6, 3))
+    make_day(tmp_path, '2094', '02', expected=(6, 4))
+    make_day(tmp_path, '2094', '03', input='x\n')
+    commands.test_all('2094')
+    output = capsys.readouterr().out
+    assert 'Testing 3 day(s) of 2094' in output
+    assert 'FAIL' in output and 'got 3, expected 4' in output
+    assert '2094/03: ValueError' in output
+    assert '1/3 day(s) passed' in output
+    assert 'speedup' in output
+
+
+SLOW_SOLUTION = '''import time
+
+
+class Puzzle:
+    always_run_part_1 = False
+
+    def __init__(self, lines, is_test=False):
+        self.value = int(lines[0])
+
+    def part1(self):
+        time.sleep(0.1)
+        return self.value
+'''
+
+
+def make_example(tmp_path, year, day, name, expected, input):
+    (tmp_path / year / day / name).write_text(f'example\n{expected}\n---\n{input}\n')
+
+
+def test_example_cases(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    make_day(tmp_path, '2093', '01')
+    for name in ('test_part2_a.txt', 'test_part1_b.txt', 'test_part1_a.txt', 'notes.txt'):
+        make_example(tmp_path, '2093', '01', name, 0, 0)
+    assert runner.example_cases('2093', '01') == [
+        ('test_part1_a.txt', 1), ('test_part1_b.txt', 1), ('test_part2_a.txt', 2)
+    ]
+    assert runner.example_cases('2093', '01', part=2) == [('test_part2_a.txt', 2)]
+
+
+def test_run_example(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    make_day(tmp_path, '2092', '01')
+    make_example(tmp_path, '2092', '01', 'test_part2_a.txt', 7, '5\n7')
+    result = runner.run_example('2092', '01', 'test_part2_a.txt', 2)
+    assert (result.answer, result.expected, result.output) == (7, '7', 'parsing\n')
+    assert not runner.example_failed(result)
+
+
+def test_test_examples_in_order(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    make_day(tmp_path, '2091', '01')
+    make_example(tmp_path, '2091', '01', 'test_part1_b.txt', 3, '1\n2')
+    make_example(tmp_path, '2091', '01', 'test_part1_a.txt', 4, '1\n2')
+    commands.test('2091', '01', example=True, part='1')
+    output = capsys.readouterr().out
+    assert output.index('test_part1_a.txt') < output.index('test_part1_b.txt')
+    assert 'Part 1 Output 3 does NOT match expected 4' in output
+    assert 'Part 1 Output 3 matches expected 3' in output
+    assert 'TEST FAILED' in output
+
+
+@patch('concurrent.futures.ProcessPoolExecutor',
+       lambda max_workers: ThreadPoolExecutor(max_workers=1))
+def test_test_examples_fail_fast(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    make_day(tmp_path, '2090', '01', solution=SLOW_SOLUTION)
+    make_example(tmp_path, '2090', '01', 'test_part1_1.txt', 2, 1)
+    for case in range(2, 6):
+        make_example(tmp_path, '2090', '01', f'test_part1_{case}.txt', 1, 1)
+    commands.test('2090', '01', example=True, fail_fast=True)
+    output = capsys.readouterr().out
+    assert 'Part 1 Output 1 does NOT match expected 2' in output
+    assert 'Skipped test input file test_part1_5.txt' in output
+    assert 'TEST FAILED' in output
+
+
+def test_compute_answers_parallel(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    make_day(tmp_path, '2089', '01')
+    recorder = PhaseRecorder()
+    answers = runner.compute_answers_parallel('2089', '01', ['1', '2', '3'], recorder=recorder)
+    assert answers[:2] == (6, 3)
+    assert [phase.name for phase in recorder.phases] == ['import', 'read_input', 'construct',
+                                                         'part1', 'part2']
+
+
+def test_compute_answers_parallel_dependent_parts(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    make_day(tmp_path, '2088', '01', solution=SOLUTION.replace('= False', '= True'))
+    recorder = PhaseRecorder()
+    answers = runner.compute_answers_parallel('2088', '01', ['1', '2', '3'], recorder=recorder)
+    assert answers[:2] == (6, 3)
+    # the part 2 worker ran part 1 first, only its part 2 is reported
+    assert [phase.name for phase in recorder.phases] == ['import', 'read_input', 'construct',
+                                                         'part1', 'part2']
+
+
+STATEFUL_SOLUTION = '''class Base:
+    def __init__(self, lines, is_test=False):
+        self.always_run_part_1 = True
+
+
+class Puzzle(Base):
+    def __init__(self, lines, is_test=False):
+        Base.__init__(self, lines, is_test)
+        self.nums = [int(line) for line in lines]
+
+    def part1(self):
+        self.total = sum(self.nums)
+        return self.total
+
+    def part2(self):
+        return self.total * 2
+'''
+
+
+def test_compute_answers_parallel_flag_set_on_instance(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    make_day(tmp_path, '2082', '01', solution=STATEFUL_SOLUTION)
+    answers = runner.compute_answers_parallel('2082', '01', ['1', '2', '3'])
+    assert answers[:2] == (6, 12)
+
+
+RUNAWAY_SOLUTION = '''class Puzzle:
+    always_run_part_1 = False
+
+    def __init__(self, lines, is_test=False):
+        self.mode = lines[0]
+
+    def part1(self):
+        if self.mode == 'loop':
+            while True:
+                pass
+        kept = []
+        while True:
+            kept.append(bytearray(10**7))
+'''
+
+
+def test_run_sandboxed(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    make_day(tmp_path, '2087', '01')
+    recorder = PhaseRecorder()
+    result = runner.run_sandboxed('2087', '01', ['1', '2'], recorder=recorder, timeout=10)
+    assert (result.status, result.part1, result.part2) == (RunStatus.OK, 3, 2)
+    assert [phase.name for phase in recorder.phases] == ['import', 'read_input', 'construct',
+                                                         'part1', 'part2']
+
+
+def test_run_sandboxed_timeout(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    make_day(tmp_path, '2086', '01', solution=RUNAWAY_SOLUTION)
+    result = runner.run_sandboxed('2086', '01', ['loop'], timeout=0.5)
+    assert result.status == RunStatus.TIMEOUT
+    assert result.message == 'no answer within 0.5s'
+
+
+def test_run_sandboxed_oom(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    make_day(tmp_path, '2085', '01', solution=RUNAWAY_SOLUTION)
+    result = runner.run_sandboxed('2085', '01', ['alloc'], timeout=30,
+                                  memory_limit=300 * 1024 * 1024)
+    assert result.status == RunStatus.OOM
+    assert result.part1 is None
+
+
+def test_run_sandboxed_without_resource(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    make_day(tmp_path, '2083', '01')
+    monkeypatch.setattr(runner, 'resource', None)
+    result = runner.run_sandboxed('2083', '01', ['1', '2'], timeout=10,
+                                  memory_limit=300 * 1024 * 1024)
+    assert result.status == RunStatus.OK
+    assert 'not enforced on this platform' in capsys.readouterr().out
+
+
+def test_run_sandboxed_error(tmp_path, monkeypatch, capfd):
+    monkeypatch.chdir(tmp_path)
+    make_day(tmp_path, '2084', '01')
+    result = runner.run_sandboxed('2084', '01', ['x'], timeout=10)
+    assert result.status == RunStatus.ERROR
+    assert result.message.startswith('ValueError')
+    assert 'Traceback' in capfd.readouterr().err
+
+
+def test_check_and_print_results_timeout(capsys):
+    assert commands.check_and_print_results(None, 0, None, None, 0, None,
+                                            run_status=RunStatus.TIMEOUT,
+                                            message='no answer within 1s')
+    assert capsys.readouterr().out == 'TIMEOUT: no answer within 1s\n'
@@ -0,0 +1,105 @@
+import os
+import sys
+import pytest
+from _fixtures import env_patch_fixture, patch_env
+
+from advent_cli import snapshot
+from advent_cli.phases import PhaseRecorder
+from advent_cli.utils import compute_answers, input_file
+
+
+SOLUTION = '''from . import helper
+
+constructed = []
+
+
+class Puzzle:
+    always_run_part_1 = False
+    cache_parsed = True
+
+    def __init__(self, lines, is_test=False):
+        constructed.append(self)
+        self.nums = [int(line) for line in lines]
+
+    def part1(self):
+        return sum(self.nums)
+
+    def part2(self):
+        return max(self.nums)
+'''
+
+
+@pytest.fixture(autouse=True)
+def day_fixture(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / '2087' / '01'
+    path.mkdir(parents=True)
+    (path / 'solution.py').write_text(SOLUTION)
+    (path / 'helper.py').write_text('')
+    (path / 'input.txt').write_text('1\n2\n3\n')
+    with patch_env({'ADVENT_CACHE_DIR': str(tmp_path / 'cache')}):
+        yield path
+    for name in [name for name in sys.modules if name.startswith('2087')]:
+        del sys.modules[name]
+
+
+def key():
+    return snapshot.snapshot_key('2087', '01', 'solution', '2087/01/input.txt', 'lines')
+
+
+def test_restored_without_construct():
+    recorder = PhaseRecorder()
+    answers = compute_answers('2087', '01', input_file('2087', '01'), recorder=recorder)
+    assert answers[:2] == (6, 3)
+    assert [p.name for p in recorder.phases] == ['import', 'restore', 'read_input',
+                                                 'construct', 'snapshot', 'part1', 'part2']
+    recorder = PhaseRecorder()
+    answers = compute_answers('2087', '01', input_file('2087', '01'), recorder=recorder)
+    assert answers[:2] == (6, 3)
+    assert [p.name for p in recorder.phases] == ['import', 'restore', 'part1', 'part2']
+    assert len(sys.modules['2087.01.solution'].constructed) == 1
+
+
+def test_example_inputs_are_not_snapshotted():
+    compute_answers('2087', '01', ['1', '2'], example=True)
+    assert not os.path.exists(snapshot.snapshot_dir())
+
+
+def test_key_ignores_part_methods(day_fixture):
+    before = key()
+    (day_fixture / 'solution.py').write_text(
+        SOLUTION.replace('return sum(self.nums)', 'return sum(self.nums) * 1  # faster')
+    )
+    assert key() == before
+    (day_fixture / 'solution.py').write_text(SOLUTION.replace('int(line)', 'int(line) + 1'))
+    assert key() != before
+
+
+def test_key_covers_input_and_helpers(day_fixture):
+    before = key()
+    (day_fixture / 'helper.py').write_text('x = 1\n')
+    with_helper = key()
+    assert with_helper != before
+    (day_fixture / 'unused.py').write_text('')
+    (day_fixture / 'solution2.py').write_text('')
+    assert key() == with_helper
+    (day_fixture / 'input.txt').write_text('1\n2\n4\n')
+    assert key() != with_helper
+
+
+def test_corrupt_snapshot_is_dropped():
+    os.makedirs(snapshot.snapshot_dir())
+    with open(os.path.join(snapshot.snapshot_dir(), 'abc.pickle'), 'wb') as f:
+        f.write(b'not a pickle')
+    assert snapshot.load('abc') is None
+    assert os.listdir(snapshot.snapshot_dir()) == []
+
+
+def test_eviction():
+    for i, name in enumerate('abc'):
+        snapshot.store(name, list(range(100)))
+        os.utime(os.path.join(snapshot.snapshot_dir(), f'{name}.pickle'), (i, i))
+    size = os.path.getsize(os.path.join(snapshot.snapshot_dir(), 'a.pickle'))
+    snapshot.load('a')
+    snapshot.evict(2 * size)
+    assert sorted(os.listdir(snapshot.snapshot_dir())) == ['a.pickle', 'c.pickle']
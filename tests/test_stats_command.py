@@ -1,3 +1,6 @@
+import json
+import os
+import time
 from freezegun import freeze_time
 from mock import patch, MagicMock
 from _fixtures import env_patch_fixture
@@ -6,7 +9,7 @@ from advent_cli import commands
 
 
 @freeze_time('2099-12-03 05:00:00')
-@patch('requests.get')
+@patch('advent_cli.client.get')
 def test_personal_stats(mock_get, capsys):
     mock_get.return_value.text = (
         '<article><pre>'
@@ -36,9 +39,10 @@ def test_personal_stats(mock_get, capsys):
 
 
 @freeze_time('2099-12-03 05:00:00')
-@patch('requests.get')
+@patch('advent_cli.client.get')
 def test_private_stats(mock_get, capsys):
     mock_get.side_effect = [
+        MagicMock(status_code=404),
         MagicMock(text=(
             '<article><p>'
             'This is the private leaderboard of example for Advent of Code 2099.'
@@ -75,9 +79,10 @@ def test_private_stats(mock_get, capsys):
 
 
 @freeze_time('2099-12-03 05:00:00')
-@patch('requests.get')
+@patch('advent_cli.client.get')
 def test_private_stats(mock_get, capsys):
     mock_get.side_effect = [
+        MagicMock(status_code=404),
         MagicMock(text=(
             '<div class="user">Your Name<span class="star-count">99*</span></div>'
             '<article><p>'
@@ -104,3 +109,75 @@ def test_private_stats(mock_get, capsys):
         ' 1) 99 */.                       example (https://github.com/example)\n\n'
         '(* 2 stars) (/ 1 star) (. 0 stars)\n\n'
     )
+
+
+def make_private_board(owner, score):
+    return (
+        '<article><p>'
+        f'This is the private leaderboard of {owner} for Advent of Code 2099.'
+        '</p><div class="privboard-row"></div>'
+        '<div class="privboard-row">'
+        f'<span class="privboard-position"> 1)</span>{score}'
+        '<span class="privboard-star-both">*</span>' +
+        '<span class="privboard-star-locked">*</span>'*24 +
+        f'<span class="privboard-name">{owner}</span>'
+        '</div></article>'
+    )
+
+
+@freeze_time('2099-12-03 05:00:00')
+@patch.dict(os.environ, {'ADVENT_PRIV_BOARDS': '1,2,3', 'ADVENT_MAX_CONCURRENCY': '3'})
+@patch('advent_cli.client.get')
+def test_private_stats_multiple_boards_in_order(mock_get, capsys):
+    def fake_get(url):
+        if url.endswith('.json'):
+            return MagicMock(status_code=404)
+        board_id = url.rsplit('/', 1)[1]
+        # make the first board the slowest so it would finish last
+        time.sleep({'1': 0.2, '2': 0.1, '3': 0}[board_id])
+        return MagicMock(text=make_private_board(f'owner{board_id}', board_id))
+    mock_get.side_effect = fake_get
+    commands.private_leaderboard_stats('2099')
+    captured_stdout = capsys.readouterr().out
+    owners = [line for line in captured_stdout.split('\n') if 'private leaderboard' in line]
+    assert owners == ["owner1's private leaderboard (1)",
+                      "owner2's private leaderboard (2)",
+                      "owner3's private leaderboard (3)"]
+    assert mock_get.call_count == 6
+
+
+@freeze_time('2099-12-03 05:00:00')
+@patch('advent_cli.client.get')
+def test_private_stats_logged_out(mock_get, capsys):
+    mock_get.return_value.text = '[Log In]'
+    commands.private_leaderboard_stats('2099')
+    assert capsys.readouterr().out == 'Session cookie is invalid or expired.\n'
+
+
+@freeze_time('2099-12-03 05:00:00')
+@patch('advent_cli.client.get')
+def test_private_stats_json(mock_get, capsys):
+    mock_get.return_value.status_code = 200
+    mock_get.return_value.text = json.dumps({
+        'owner_id': 1, 'event': '2099',
+        'members': {
+            '1': {'id': 1, 'name': 'example', 'local_score': 99, 'stars': 3,
+                  'last_star_ts': 10, 'completion_day_level': {
+                      '1': {'1': {}, '2': {}}, '2': {'1': {}}}},
+            '2': {'id': 2, 'name': None, 'local_score': 92, 'stars': 2,
+                  'last_star_ts': 20, 'completion_day_level': {'1': {'1': {}, '2': {}}}},
+        }
+    })
+    commands.private_leaderboard_stats('2099')
+    captured_stdout = capsys.readouterr().out
+    assert captured_stdout == (
+        '\nexample\'s private leaderboard (1111111)\n\n'
+        '                1111111111222222\n'
+        '       1234567890123456789012345\n'
+        ' 1) 99 */.                       example \n'
+        ' 2) 92 *..                       (anonymous user #2) \n\n'
+        '(* 2 stars) (/ 1 star) (. 0 stars)\n\n'
+    )
+    mock_get.assert_called_once_with(
+        'https://adventofcode.com/2099/leaderboard/private/view/1111111.json'
+    )
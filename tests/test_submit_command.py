@@ -2,6 +2,7 @@ from mock import patch, call, mock_open
 from _fixtures import env_patch_fixture
 
 from advent_cli import commands
+from advent_cli.runner import DayResult
 from advent_cli.utils import Status
 
 
@@ -14,7 +15,7 @@ def test_submit_no_solution(mock_exists, mock_compute, capsys):
 
 
 @patch('builtins.open', new_callable=mock_open())
-@patch('requests.get')
+@patch('advent_cli.client.get')
 @patch('advent_cli.commands.submit_answer', return_value=(Status.PASS, None))
 @patch('advent_cli.commands.compute_answers', return_value=(5, None))
 @patch('os.path.exists', return_value=True)
@@ -84,3 +85,52 @@ def test_submit_no_dir(mock_exists, mock_getcwd, mock_open, capsys):
     assert captured_stdout == ('Directory does not exist:\n'
                                '  "/fake/path/2099/99/"\n')
     mock_open.assert_not_called()
+
+
+@patch('time.sleep')
+@patch('advent_cli.commands.submit_answer',
+       side_effect=[(Status.RATE_LIMIT, 30), (Status.PASS, None)])
+def test_submit_waits_out_rate_limit(mock_submit, mock_sleep, capsys):
+    assert commands.submit_and_wait('2099', '99', 1, 5) == (Status.PASS, None)
+    mock_sleep.assert_called_once_with(31)
+    assert mock_submit.call_count == 2
+    assert capsys.readouterr().out == 'Rate limited, retrying in 30s...\n'
+
+
+@patch('advent_cli.memo.answer_key', return_value='key')
+@patch('advent_cli.commands.send_answer', return_value=Status.PASS)
+@patch('advent_cli.commands.run_days')
+@patch('advent_cli.runner.solved_days', return_value=['01', '02', '03'])
+def test_submit_all_pending(mock_days, mock_run, mock_send, mock_key, capsys):
+    commands.record_result('2099', '02', True, 1, 3, 1)
+    commands.record_result('2099', '03', True, 1, 5, 1)
+    commands.record_result('2099', '03', True, 2, 6, 1)
+    mock_run.return_value = [DayResult('01', 1, 2, 10, 20, 0, None),
+                             DayResult('02', 3, 4, 30, 40, 0, None)]
+    commands.submit_all_pending('2099')
+    mock_run.assert_called_once_with('2099', ['01', '02'], 'solution')
+    assert mock_send.call_args_list == [call('2099', '01', 1, 1, 10, 'key'),
+                                        call('2099', '02', 2, 4, 40, 'key'),
+                                        call('2099', '01', 2, 2, 20, 'key')]
+
+
+@patch('advent_cli.utils.custom_markdownify', side_effect=lambda html: html)
+@patch('advent_cli.client.get')
+@patch('advent_cli.commands.submit_answer', return_value=(Status.PASS, None))
+def test_send_answer_fetches_page_once(mock_submit, mock_get, mock_markdownify, tmp_path,
+                                       monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / '2099' / '99').mkdir(parents=True)
+    (tmp_path / '2099' / '99' / 'prompt.md').write_text('part one')
+    mock_get.return_value.text = ('<article class="day-desc">one</article>'
+                                  '<p>Your puzzle answer was <code>5</code>.</p>'
+                                  '<article class="day-desc">two</article>')
+    commands.send_answer('2099', '99', 1, 5, 10)
+    mock_get.assert_called_once()
+    assert (tmp_path / '2099' / '99' / 'prompt.md').read_text() == 'onetwo'
+    assert commands.get_expected_from_from_saved('2099', '99') == ('5', None)
+
+    # part 1's answer is known, so a correct part 2 needs nothing but the submission
+    commands.send_answer('2099', '99', 2, 7, 10)
+    mock_get.assert_called_once()
+    assert commands.get_expected_from_from_saved('2099', '99') == ('5', '7')
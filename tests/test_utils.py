@@ -1,8 +1,9 @@
 from mock import patch, mock_open
-from _fixtures import env_patch_fixture
+from _fixtures import env_patch_fixture, patch_env
 
 import os
 from advent_cli import utils
+from advent_cli.phases import PhaseRecorder
 
 
 def test_utils_colored_disabled():
@@ -41,52 +42,94 @@ def test_compute_answers(mock_import_module):
     assert part2_answer == 8
 
 
-@patch('requests.post')
+@patch('advent_cli.client.post')
 def test_submit_answer_pass(mock_post):
     mock_post.return_value.text = "That's the right answer"
     assert utils.submit_answer('2099', '99', '1', '5') == (utils.Status.PASS, None)
 
 
-@patch('requests.post')
+@patch('advent_cli.client.post')
 def test_submit_answer_fail(mock_post):
     mock_post.return_value.text = "That's not the right answer"
     assert utils.submit_answer('2099', '99', '1', '5') == (utils.Status.FAIL, None)
 
 
-@patch('requests.post')
+@patch('advent_cli.client.post')
+def test_submit_answer_fail_bound(mock_post):
+    mock_post.return_value.text = "That's not the right answer; your answer is too high."
+    assert utils.submit_answer('2099', '99', '1', '5') == (utils.Status.FAIL, 'high')
+
+
+@patch('advent_cli.client.post')
 def test_submit_answer_ratelimit(mock_post):
     mock_post.return_value.text = 'You gave an answer too recently'
     assert utils.submit_answer('2099', '99', '1', '5') == (utils.Status.RATE_LIMIT, None)
 
 
-@patch('requests.post')
+@patch('advent_cli.client.post')
+def test_submit_answer_ratelimit_wait(mock_post):
+    mock_post.return_value.text = ('You gave an answer too recently; you have to wait after '
+                                   'submitting an answer before trying again.  You have 1m 5s '
+                                   'left to wait.')
+    assert utils.submit_answer('2099', '99', '1', '5') == (utils.Status.RATE_LIMIT, 65)
+
+
+@patch('advent_cli.client.post')
 def test_submit_answer_completed(mock_post):
     mock_post.return_value.text = 'Did you already complete it?'
     assert utils.submit_answer('2099', '99', '1', '5') == (utils.Status.COMPLETED, None)
 
 
-@patch('requests.post')
+@patch('advent_cli.client.post')
 def test_submit_answer_unknown_response(mock_post):
     mock_post.return_value.text = 'Error'
     assert utils.submit_answer('2099', '99', '1', '5') == (utils.Status.UNKNOWN, 'Error')
 
 
+def test_parse_day_page():
+    page = utils.parse_day_page('<main><article class="day-desc"><h2>--- One ---</h2>'
+                                '</article><p>Your puzzle answer was <code>12</code>.</p>'
+                                '<article class="day-desc"><h2>--- Two ---</h2></article>'
+                                '<p>Answer: <input/></p></main>')
+    assert page.parts == ['<h2>--- One ---</h2>', '<h2>--- Two ---</h2>']
+    assert page.answers == ['12']
+
+
 def test_custom_markdown():
     html = ('<pre><code>this is <em>emphasized</em> text</code></pre>'
             'this is <em>not</em> in a code block')
-    with patch.dict(os.environ, {'ADVENT_MARKDOWN_EM': 'default'}):
+    with patch_env({'ADVENT_MARKDOWN_EM': 'default'}):
         assert utils.custom_markdownify(html) == ('\n```\nthis is *emphasized* text'
                                                   '\n```\nthis is *not* in a code block')
-    with patch.dict(os.environ, {'ADVENT_MARKDOWN_EM': 'none'}):
+    with patch_env({'ADVENT_MARKDOWN_EM': 'none'}):
         assert utils.custom_markdownify(html) == ('\n```\nthis is emphasized text'
                                                   '\n```\nthis is *not* in a code block')
-    with patch.dict(os.environ, {'ADVENT_MARKDOWN_EM': 'ib'}):
+    with patch_env({'ADVENT_MARKDOWN_EM': 'ib'}):
         assert utils.custom_markdownify(html) == ('\n<pre><code>this is '
                                                   '<i><b>emphasized</b></i> '
                                                   'text</code></pre>\n'
                                                   'this is *not* in a code block')
-    with patch.dict(os.environ, {'ADVENT_MARKDOWN_EM': 'mark'}):
+    with patch_env({'ADVENT_MARKDOWN_EM': 'mark'}):
         assert utils.custom_markdownify(html) == ('\n<pre><code>this is '
                                                   '<mark>emphasized</mark> '
                                                   'text</code></pre>\n'
                                                   'this is *not* in a code block')
+
+
+@patch('advent_cli.utils.import_module')
+def test_compute_answers_phases(mock_import_module):
+    mock_import_module.return_value.Puzzle.input_mode = 'lines'
+    mock_import_module.return_value.Puzzle.return_value.always_run_part_1 = False
+    mock_import_module.return_value.Puzzle.return_value.part1.return_value = 1
+    mock_import_module.return_value.Puzzle.return_value.part2.return_value = 2
+    recorder = PhaseRecorder()
+    answers = utils.compute_answers('2099', '99', ['1'], recorder=recorder)
+    assert answers[:2] == (1, 2)
+    assert [p.name for p in recorder.phases] == ['import', 'read_input', 'construct',
+                                                 'part1', 'part2']
+    assert all(phase.wall_ns >= 0 and phase.cpu_ns >= 0 for phase in recorder.phases)
+
+    recorder = PhaseRecorder()
+    answers = utils.compute_answers('2099', '99', ['1'], part=2, recorder=recorder)
+    assert answers == (None, 2, 0, answers[3])
+    assert recorder.get('part1') is None
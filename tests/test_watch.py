@@ -0,0 +1,100 @@
+import sys
+from mock import patch
+from _fixtures import env_patch_fixture
+
+from advent_cli import commands, watch
+from advent_cli.utils import load_solution
+
+
+def write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def test_watched_files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for name in ('solution.py', 'helper.py', 'input.txt', 'example_input.txt',
+                 'test_part1_a.txt', 'prompt.md'):
+        write(tmp_path / '2079' / '01' / name, '')
+    assert list(watch.watched_files('2079', '01')) == [
+        '2079/01/helper.py', '2079/01/input.txt', '2079/01/solution.py'
+    ]
+    assert list(watch.watched_files('2079', '01', example=True)) == [
+        '2079/01/example_input.txt', '2079/01/helper.py', '2079/01/solution.py',
+        '2079/01/test_part1_a.txt'
+    ]
+
+
+def test_changed_files():
+    before = {'a.py': (1, 10), 'b.py': (1, 10), 'c.py': (1, 10)}
+    after = {'a.py': (1, 10), 'b.py': (2, 10), 'd.py': (1, 10)}
+    assert watch.changed_files(before, after) == ['b.py', 'c.py', 'd.py']
+
+
+def test_reload_modules(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    solution = tmp_path / '2078' / '01' / 'solution.py'
+    write(solution, 'from . import helper\nVALUE = helper.VALUE\n')
+    write(tmp_path / '2078' / '01' / 'helper.py', 'VALUE = 1\n')
+    assert load_solution('2078', '01').VALUE == 1
+
+    # same length as before, which the .pyc check on its own would not notice
+    write(tmp_path / '2078' / '01' / 'helper.py', 'VALUE = 2\n')
+    reloaded = watch.reload_modules('2078', '01', ['2078/01/helper.py'])
+    assert reloaded == ['2078.01.helper', '2078.01.solution']
+    assert load_solution('2078', '01').VALUE == 2
+
+    write(solution, 'VALUE = 3\n')
+    assert watch.reload_modules('2078', '01', ['2078/01/solution.py', '2078/01/input.txt']) \
+        == ['2078.01.solution']
+    assert load_solution('2078', '01').VALUE == 3
+
+
+def test_load_solution_path_added_once(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write(tmp_path / '2077' / '01' / 'solution.py', '')
+    load_solution('2077', '01')
+    load_solution('2077', '01')
+    assert sys.path.count(str(tmp_path)) == 1
+
+
+SOLUTION = '''class Puzzle:
+    always_run_part_1 = False
+
+    def __init__(self, lines, is_test=False):
+        self.lines = lines
+
+    def part1(self):
+        return {}
+
+    def part2(self):
+        return None
+'''
+
+
+def test_watch_survives_errors(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    solution = tmp_path / '2076' / '01' / 'solution.py'
+    write(solution, SOLUTION.format('1 / 0'))
+    write(tmp_path / '2076' / '01' / 'input.txt', '1\n')
+    # a syntax error while reloading, then the fix
+    edits = [SOLUTION.format('1 +'), SOLUTION.format('41 + 1')]
+
+    def wait_for_changes(year, day, example):
+        if not edits:
+            raise KeyboardInterrupt
+        solution.write_text(edits.pop(0))
+        return [str(solution.relative_to(tmp_path))]
+
+    try:
+        with patch('advent_cli.watch.wait_for_changes', side_effect=wait_for_changes):
+            commands.watch_test('2076', '01', force=True)
+    finally:
+        for name in [name for name in sys.modules if name.startswith('2076')]:
+            del sys.modules[name]
+    captured = capsys.readouterr()
+    assert 'ZeroDivisionError' in captured.err
+    assert 'SyntaxError' in captured.err
+    assert 'Reloaded: 2076.01.solution' in captured.out
+    assert captured.out.count('Part 1 (') == 1
+    assert 'Part 1 (Time: ' in captured.out and '): 42' in captured.out